@@ -2,67 +2,85 @@
 Configuration settings for MCP File Manager.
 """
 
+import functools
 import os
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Tuple
 
+from mcp_local.core.constants import (
+    BACKUP_DIR,
+    COMMAND_TIMEOUT,
+    DANGEROUS_COMMANDS,
+    DEFAULT_EXCLUDE_PATTERNS,
+    MAX_EDIT_HISTORY,
+    MAX_FILE_SIZE_BYTES,
+    TEXT_EXTENSIONS,
+)
+
+# slots=True needs Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    return int(os.environ.get(name, default))
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class Settings:
-    """Configuration settings."""
-    
+    """Configuration settings, read from the environment once at construction."""
+
     # Server settings
     SERVER_NAME: str = "mcp-file-manager"
     DEFAULT_TRANSPORT: str = "stdio"
-    
+
     # File operation settings
-    MAX_FILE_SIZE_BYTES: int = int(os.getenv("MCP_MAX_FILE_SIZE", 1024 * 1024))  # 1MB
+    MAX_FILE_SIZE_BYTES: int = field(
+        default_factory=lambda: _env_int("MCP_MAX_FILE_SIZE", MAX_FILE_SIZE_BYTES))
     DEFAULT_ENCODING: str = "utf-8"
-    
+
     # Backup settings
-    BACKUP_DIR: Path = Path.home() / ".mcp_backups"
-    MAX_EDIT_HISTORY: int = int(os.getenv("MCP_MAX_HISTORY", 100))
-    BACKUP_RETENTION_DAYS: int = int(os.getenv("MCP_BACKUP_RETENTION", 30))
-    
+    BACKUP_DIR: Path = BACKUP_DIR
+    MAX_EDIT_HISTORY: int = field(
+        default_factory=lambda: _env_int("MCP_MAX_HISTORY", MAX_EDIT_HISTORY))
+    BACKUP_RETENTION_DAYS: int = field(
+        default_factory=lambda: _env_int("MCP_BACKUP_RETENTION", 30))
+
     # Search settings
     DEFAULT_MAX_SEARCH_RESULTS: int = 1000
     DEFAULT_CONTEXT_LINES: int = 2
-    
+
     # Security settings
-    DANGEROUS_COMMANDS: List[str] = ["rm", "del", "format", "sudo", "su", "passwd"]
-    COMMAND_TIMEOUT: int = 30
-    
+    DANGEROUS_COMMANDS: Tuple[str, ...] = DANGEROUS_COMMANDS
+    COMMAND_TIMEOUT: int = COMMAND_TIMEOUT
+
     # File type detection
-    TEXT_EXTENSIONS: set = {
-        '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss', 
-        '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.log', 
-        '.ini', '.cfg', '.conf', '.sh', '.bat', '.sql', '.r', '.php',
-        '.rb', '.go', '.rs', '.swift', '.java', '.c', '.cpp', '.h',
-        '.cs', '.vue', '.svelte', '.toml', '.dockerfile'
-    }
-    
+    TEXT_EXTENSIONS: FrozenSet[str] = TEXT_EXTENSIONS
+
     # Exclude patterns for searches
-    DEFAULT_EXCLUDE_PATTERNS: List[str] = [
-        ".git/*", "node_modules/*", "__pycache__/*", "*.pyc", "*.pyo", 
-        ".DS_Store", "Thumbs.db", "*.log", ".env", ".vscode/*", ".idea/*",
-        "dist/*", "build/*", "*.egg-info/*", ".pytest_cache/*", 
-        "coverage/*", ".coverage", "*.min.js", "*.min.css"
-    ]
-    
-    @classmethod
-    def get_backup_dir(cls) -> Path:
-        """Get backup directory, creating it if needed."""
-        cls.BACKUP_DIR.mkdir(exist_ok=True)
-        return cls.BACKUP_DIR
-    
-    @classmethod
-    def load_from_env(cls) -> Dict[str, any]:
-        """Load settings from environment variables."""
-        return {
-            "max_file_size": cls.MAX_FILE_SIZE_BYTES,
-            "backup_dir": str(cls.BACKUP_DIR),
-            "max_history": cls.MAX_EDIT_HISTORY,
-            "backup_retention_days": cls.BACKUP_RETENTION_DAYS,
-        }
+    DEFAULT_EXCLUDE_PATTERNS: Tuple[str, ...] = DEFAULT_EXCLUDE_PATTERNS
 
 
 # Global settings instance
 settings = Settings()
+
+
+@functools.lru_cache(maxsize=None)
+def get_backup_dir() -> Path:
+    """Get backup directory, creating it on first use."""
+    settings.BACKUP_DIR.mkdir(exist_ok=True)
+    return settings.BACKUP_DIR
+
+
+@functools.lru_cache(maxsize=None)
+def load_from_env() -> Mapping[str, Any]:
+    """Settings loaded from environment variables (read-only)."""
+    return MappingProxyType({
+        "max_file_size": settings.MAX_FILE_SIZE_BYTES,
+        "backup_dir": str(settings.BACKUP_DIR),
+        "max_history": settings.MAX_EDIT_HISTORY,
+        "backup_retention_days": settings.BACKUP_RETENTION_DAYS,
+    })
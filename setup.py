@@ -1,44 +1,29 @@
 #!/usr/bin/env python3
 
-from setuptools import setup, find_packages
+# Project metadata lives in pyproject.toml
+import os
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+from setuptools import setup
 
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+ext_modules = []
 
-setup(
-    name="mcp-file-manager",
-    version="1.0.0",
-    author="aissam",
-    author_email="aissamirhir@gmail.com",
-    description="A comprehensive MCP server for file management and system operations",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/asmaa/mcp-file-manager",
-    package_dir={"": "src"},
-    packages=find_packages(where="src"),
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: Developers",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-    ],
-    python_requires=">=3.8",
-    install_requires=requirements,
-    entry_points={
-        "console_scripts": [
-            "mcp-file-manager=mcp_file_manager.main:main",
-        ],
-    },
-    include_package_data=True,
-    package_data={
-        "mcp_file_manager": ["config/*.conf"],
-    },
-)
+# Opt-in ahead-of-time compilation with mypyc:
+#   MCP_LOCAL_MYPYC=1 pip install .
+# Only modules whose classes FastMCP does not introspect are listed; compiled
+# methods carry no inspect.signature(), which tool registration relies on.
+if os.environ.get("MCP_LOCAL_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    compiled = ["src/mcp_local/services/history_service.py"]
+    ext_modules = mypycify([
+        "--allow-untyped-defs",
+        "--no-warn-return-any",
+        "--ignore-missing-imports",
+        "--follow-imports=silent",
+        "--disable-error-code=annotation-unchecked",
+        *compiled,
+        # One top-level shared library, so loading it does not go through
+        # a package that is still being imported
+    ], separate=[(compiled, "mcp_local_native")])
+
+setup(ext_modules=ext_modules)
@@ -9,6 +9,12 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .server import create_server
-
 __all__ = ["create_server"]
+
+
+def __getattr__(name):
+    """Load the server lazily so importing the package stays cheap"""
+    if name == "create_server":
+        from .server import create_server
+        return create_server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
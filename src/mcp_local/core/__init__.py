@@ -5,7 +5,8 @@ This module contains the foundational classes, utilities, and configuration
 for the MCP Local file manager.
 """
 
-from .base import ToolBase, FileOperationBase, SearchBase, ServiceBase
+import importlib
+
 from .config import (
     DEFAULT_EXCLUDE_PATTERNS,
     FILE_TYPE_GROUPS,
@@ -15,31 +16,28 @@ from .config import (
     DANGEROUS_COMMANDS,
     COMMAND_TIMEOUT
 )
-from .exceptions import (
-    MCPFileManagerError,
-    FileNotFoundError,
-    FileAccessError,
-    FileSizeError,
-    InvalidPathError,
-    SearchError,
-    BackupError,
-    CommandError,
-    ValidationError
-)
 from .utils import (
+    READ_FLAGS,
+    compile_includes,
+    is_text_by_ext,
+    read_fd,
     should_exclude_file,
+    walk_filtered,
     is_text_file,
     format_file_size,
     validate_path,
+    validate_path_str,
     get_relative_path
 )
 
 __all__ = [
     # Base classes
+    "Tool",
     "ToolBase",
     "FileOperationBase", 
     "SearchBase",
     "ServiceBase",
+    "register_tool",
     
     # Configuration
     "DEFAULT_EXCLUDE_PATTERNS",
@@ -62,9 +60,44 @@ __all__ = [
     "ValidationError",
     
     # Utilities
+    "READ_FLAGS",
+    "compile_includes",
+    "is_text_by_ext",
+    "read_fd",
     "should_exclude_file",
+    "walk_filtered",
     "is_text_file",
     "format_file_size",
     "validate_path",
+    "validate_path_str",
     "get_relative_path"
 ]
+
+# Base classes and exceptions are loaded on first access
+_LAZY_ATTRS = {
+    "Tool": ".base",
+    "ToolBase": ".base",
+    "FileOperationBase": ".base",
+    "SearchBase": ".base",
+    "ServiceBase": ".base",
+    "register_tool": ".base",
+    "MCPFileManagerError": ".exceptions",
+    "FileNotFoundError": ".exceptions",
+    "FileAccessError": ".exceptions",
+    "FileSizeError": ".exceptions",
+    "InvalidPathError": ".exceptions",
+    "SearchError": ".exceptions",
+    "BackupError": ".exceptions",
+    "CommandError": ".exceptions",
+    "ValidationError": ".exceptions",
+}
+
+
+def __getattr__(name):
+    """Resolve lazily-loaded attributes (PEP 562)"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,13 +2,36 @@
 Base classes and interfaces for MCP File Manager
 """
 
+import functools
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Protocol, Tuple
+)
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+from .config import FILE_TYPE_GROUPS, DEFAULT_EXCLUDE_PATTERNS
+from .utils import compile_includes
+
+
+class Tool(Protocol):
+    """Structural interface for MCP tools"""
+    
+    name: str
+    description: str
+    execute: Callable[..., str]
+
 
 class ToolBase(ABC):
-    """Base class for all MCP tools"""
+    """Base class for all MCP tools
+    
+    Subclasses define execute() with an explicit signature, which
+    register_tool hands to FastMCP as-is.
+    """
+    
+    __slots__ = ('name', 'description')
     
     def __init__(self, name: str, description: str):
         self.name = name
@@ -24,9 +47,16 @@ class ToolBase(ABC):
         return True
 
 
+def register_tool(mcp: "FastMCP", tool: Tool) -> None:
+    """Register a tool's bound execute method directly with the MCP server"""
+    mcp.tool(name=tool.name, description=tool.description)(tool.execute)
+
+
 class FileOperationBase(ToolBase):
     """Base class for file operations"""
     
+    __slots__ = ()
+    
     def __init__(self, name: str, description: str):
         super().__init__(name, description)
     
@@ -47,40 +77,55 @@ class FileOperationBase(ToolBase):
     
     def check_file_size(self, path: Path, max_size: int) -> bool:
         """Check if file size is within limits"""
-        from .config import MAX_FILE_SIZE
-        
-        if not path.exists():
+        try:
+            return path.stat().st_size <= max_size
+        except FileNotFoundError:
             return True
-        
-        return path.stat().st_size <= max_size
 
 
 class SearchBase(ToolBase):
     """Base class for search operations"""
     
+    __slots__ = ()
+    
     def __init__(self, name: str, description: str):
         super().__init__(name, description)
     
     def prepare_search_patterns(self, include_patterns: Optional[str], 
                                exclude_patterns: Optional[str], 
-                               file_types: str) -> tuple:
+                               file_types: str) -> "SearchPatterns":
         """Prepare include and exclude patterns for search"""
-        from .config import FILE_TYPE_GROUPS, DEFAULT_EXCLUDE_PATTERNS
-        
-        # Prepare include patterns
-        if include_patterns:
-            include_list = [p.strip() for p in include_patterns.split(',')]
-        elif file_types in FILE_TYPE_GROUPS:
-            include_list = FILE_TYPE_GROUPS[file_types]
-        else:
-            include_list = [p.strip() for p in file_types.split(',')]
-        
-        # Prepare exclude patterns
-        exclude_list = DEFAULT_EXCLUDE_PATTERNS.copy()
-        if exclude_patterns:
-            exclude_list.extend([p.strip() for p in exclude_patterns.split(',')])
-        
-        return include_list, exclude_list
+        return _prepare_search_patterns(include_patterns, exclude_patterns, file_types)
+
+
+class SearchPatterns(NamedTuple):
+    """Prepared search filters
+    
+    ``include`` matches file names. ``exclude`` stays a pattern tuple for
+    should_exclude_file, which caches its compiled form per tuple.
+    """
+    include: Pattern
+    exclude: Tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=64)
+def _prepare_search_patterns(include_patterns: Optional[str], exclude_patterns: Optional[str],
+                             file_types: str) -> SearchPatterns:
+    """Parse and compile search filters once per distinct set of options"""
+    # Prepare include patterns
+    if include_patterns:
+        include_list = tuple(p.strip() for p in include_patterns.split(','))
+    elif file_types in FILE_TYPE_GROUPS:
+        include_list = FILE_TYPE_GROUPS[file_types]
+    else:
+        include_list = tuple(p.strip() for p in file_types.split(','))
+    
+    # Prepare exclude patterns
+    exclude_list = DEFAULT_EXCLUDE_PATTERNS
+    if exclude_patterns:
+        exclude_list += tuple(p.strip() for p in exclude_patterns.split(','))
+    
+    return SearchPatterns(compile_includes(include_list), exclude_list)
 
 
 class ServiceBase(ABC):
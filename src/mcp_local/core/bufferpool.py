@@ -0,0 +1,47 @@
+"""
+Thread-local pool of reusable read buffers
+"""
+
+import threading
+from typing import Dict, List
+
+# Buffers larger than this are allocated per call and never pooled
+MAX_POOLED_SIZE = 64 * 1024
+
+# Buffers kept per size bucket and thread
+_MAX_PER_BUCKET = 4
+
+_local = threading.local()
+
+
+def _buckets() -> Dict[int, List[bytearray]]:
+    """Get this thread's size buckets"""
+    try:
+        return _local.buckets
+    except AttributeError:
+        _local.buckets = {}
+        return _local.buckets
+
+
+def rent(size: int) -> bytearray:
+    """Get a buffer of at least size bytes, rounded up to a power of two"""
+    bucket = max(size - 1, 0).bit_length()
+    if (1 << bucket) > MAX_POOLED_SIZE:
+        return bytearray(size)
+    stack = _buckets().get(bucket)
+    if stack:
+        return stack.pop()
+    return bytearray(1 << bucket)
+
+
+def give_back(buf: bytearray) -> None:
+    """Return a rented buffer to the pool
+
+    The caller must not keep views into the buffer.
+    """
+    size = len(buf)
+    if size > MAX_POOLED_SIZE or size & (size - 1):
+        return  # Oversized or not from the pool
+    stack = _buckets().setdefault((size - 1).bit_length(), [])
+    if len(stack) < _MAX_PER_BUCKET:
+        stack.append(buf)
@@ -1,59 +1,86 @@
 """
 Constants and configuration for the MCP File Manager.
+
+This is the single source for shared constants; core/config.py and
+config/settings.py re-export from here. Values are immutable so they can be
+shared (and hashed) without defensive copies.
 """
 
+import re
 from pathlib import Path
-from typing import List, Dict
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Pattern, Tuple
 
 # Default exclude patterns (like VSCode)
-DEFAULT_EXCLUDE_PATTERNS: List[str] = [
-    ".git/*", "node_modules/*", "__pycache__/*", "*.pyc", "*.pyo", 
+DEFAULT_EXCLUDE_PATTERNS: Tuple[str, ...] = (
+    ".git/*", "node_modules/*", "__pycache__/*", "*.pyc", "*.pyo",
     ".DS_Store", "Thumbs.db", "*.log", ".env", ".vscode/*", ".idea/*",
-    "dist/*", "build/*", "*.egg-info/*", ".pytest_cache/*", 
+    "dist/*", "build/*", "*.egg-info/*", ".pytest_cache/*",
     "coverage/*", ".coverage", "*.min.js", "*.min.css"
-]
+)
 
 # Common file type groups
-FILE_TYPE_GROUPS: Dict[str, List[str]] = {
-    "code": ["*.py", "*.js", "*.ts", "*.jsx", "*.tsx", "*.java", "*.c", "*.cpp", "*.h", "*.cs", "*.php", "*.rb", "*.go", "*.rs", "*.swift"],
-    "web": ["*.html", "*.css", "*.scss", "*.sass", "*.less", "*.vue", "*.svelte"],
-    "config": ["*.json", "*.yaml", "*.yml", "*.toml", "*.ini", "*.cfg", "*.conf"],
-    "docs": ["*.md", "*.txt", "*.rst", "*.doc", "*.docx", "*.pdf"],
-    "data": ["*.csv", "*.xlsx", "*.xml", "*.sql"],
-    "all": ["*"]
-}
+FILE_TYPE_GROUPS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "code": ("*.py", "*.js", "*.ts", "*.jsx", "*.tsx", "*.java", "*.c", "*.cpp", "*.h", "*.cs", "*.php", "*.rb", "*.go", "*.rs", "*.swift"),
+    "web": ("*.html", "*.css", "*.scss", "*.sass", "*.less", "*.vue", "*.svelte"),
+    "config": ("*.json", "*.yaml", "*.yml", "*.toml", "*.ini", "*.cfg", "*.conf"),
+    "docs": ("*.md", "*.txt", "*.rst", "*.doc", "*.docx", "*.pdf"),
+    "data": ("*.csv", "*.xlsx", "*.xml", "*.sql"),
+    "all": ("*",)
+})
 
 # Common text file extensions
-TEXT_EXTENSIONS = {
-    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss', 
-    '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.log', 
+TEXT_EXTENSIONS: FrozenSet[str] = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss',
+    '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.log',
     '.ini', '.cfg', '.conf', '.sh', '.bat', '.sql', '.r', '.php',
     '.rb', '.go', '.rs', '.swift', '.java', '.c', '.cpp', '.h',
     '.cs', '.vue', '.svelte', '.toml', '.dockerfile'
-}
+})
+
+# Extensions treated as binary without reading the file
+BINARY_EXTENSIONS: FrozenSet[str] = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tiff',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar', '.jar',
+    '.exe', '.dll', '.so', '.dylib', '.o', '.a', '.class', '.pyc', '.pyo', '.whl',
+    '.mp3', '.mp4', '.wav', '.avi', '.mov', '.mkv', '.flac', '.ogg',
+    '.ttf', '.otf', '.woff', '.woff2', '.sqlite', '.db', '.bin'
+})
 
 # File size limits
-MAX_FILE_SIZE_BYTES = 1024 * 1024  # 1MB
+MAX_FILE_SIZE = 1024 * 1024  # 1MB
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE
 
-# Backup configuration
-BACKUP_DIR = Path.home() / ".mcp_backups"
-BACKUP_DIR.mkdir(exist_ok=True)
+# Backup configuration (created by BackupService, not at import)
+BACKUP_DIR = Path.home() / ".mcp_local_backups"
 
 # History configuration
-MAX_EDIT_HISTORY = 100
+MAX_EDIT_HISTORY_ENTRIES = 100
+MAX_EDIT_HISTORY = MAX_EDIT_HISTORY_ENTRIES
+
+# Security settings
+DANGEROUS_COMMANDS: Tuple[str, ...] = ('rm', 'del', 'format', 'sudo', 'su', 'passwd')
+# Refused as substrings anywhere in a command (so rmdir, userdel, visudo also match)
+DANGEROUS_COMMANDS_RE: Pattern = re.compile(
+    '|'.join(map(re.escape, DANGEROUS_COMMANDS)), re.IGNORECASE
+)
+
+# Timeout settings
+COMMAND_TIMEOUT = 30  # seconds
 
 # Formatters mapping
-FORMATTERS = {
+FORMATTERS: Mapping[str, str] = MappingProxyType({
     'python': 'black',
     'javascript': 'prettier',
     'typescript': 'prettier',
     'json': 'prettier',
     'html': 'prettier',
     'css': 'prettier'
-}
+})
 
 # Language detection mapping
-LANGUAGE_MAP = {
+LANGUAGE_MAP: Mapping[str, str] = MappingProxyType({
     '.py': 'python',
     '.js': 'javascript',
     '.ts': 'typescript',
@@ -63,4 +90,4 @@ LANGUAGE_MAP = {
     '.java': 'java',
     '.cpp': 'cpp',
     '.c': 'c'
-}
+})
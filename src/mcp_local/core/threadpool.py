@@ -0,0 +1,27 @@
+"""
+Thread pool shared by the search and system tools
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# File reads and stats release the GIL, so a few workers overlap their I/O
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared pool, starting it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                               thread_name_prefix='mcp-io')
+                atexit.register(_executor.shutdown)
+    return _executor
@@ -2,73 +2,351 @@
 Core utilities and helper functions
 """
 
+import errno
 import mimetypes
+import mmap
 import fnmatch
+import functools
+import os
+import re
+import shutil
+import stat
 from pathlib import Path
-from typing import List
+from typing import FrozenSet, Iterable, Iterator, Optional, Pattern, Tuple, Union
 
 from .config import DEFAULT_EXCLUDE_PATTERNS
+from .constants import BINARY_EXTENSIONS, TEXT_EXTENSIONS
 
+# Built once at import, from the built-in defaults plus the system MIME
+# tables (/etc/mime.types etc.), so they are not read on a tool call
+_MIME_TYPES = mimetypes.MimeTypes(filenames=[f for f in mimetypes.knownfiles if os.path.isfile(f)])
 
-def should_exclude_file(file_path: Path, exclude_patterns: List[str]) -> bool:
-    """Check if file should be excluded based on patterns"""
-    rel_path = str(file_path)
+# Raw open for binary sniffing: don't block on FIFOs, no newline translation on Windows
+_SNIFF_FLAGS = os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0) | getattr(os, 'O_BINARY', 0)
+
+# os.open flags for whole-file reads: not inherited by children, no newline translation on Windows
+READ_FLAGS = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+_HAS_PREAD = hasattr(os, 'pread')
+
+
+def _normalize_exclude(pattern: str) -> str:
+    """Anchor directory patterns anywhere in the path ("node_modules/*" -> "*/node_modules/*")"""
+    if '/' not in pattern or pattern.startswith(('*', '/')):
+        return pattern
+    return '*/' + pattern
+
+
+def _is_literal(pattern: str) -> bool:
+    """Check whether a glob pattern has no wildcard characters"""
+    return not any(c in pattern for c in '*?[')
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_excludes(patterns: Tuple[str, ...]) -> Tuple[FrozenSet[str], FrozenSet[str], Pattern, Pattern, Pattern]:
+    """Split exclude patterns into literal directory names, literal file names and three regexes
     
-    for pattern in exclude_patterns:
-        if fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(file_path.name, pattern):
-            return True
-        # Check parent directories
-        for parent in file_path.parents:
-            if fnmatch.fnmatch(str(parent), pattern):
-                return True
-    return False
+    Literal entries ("node_modules/*", ".DS_Store") are checked with set
+    lookups. The remaining globs are compiled into one union for patterns
+    without a "/", matched against the entry name alone, and one for
+    patterns with a directory part, matched against the whole path. A third
+    union matches the directories those "dir/*" patterns name, so walkers
+    can prune them without a file of the same name being excluded.
+    """
+    literal_dirs = set()
+    literal_names = set()
+    name_globs = []
+    path_globs = []
+    dir_globs = []
+    for pattern in patterns:
+        if pattern.endswith('/*') and '/' not in pattern[:-2] and _is_literal(pattern[:-2]):
+            literal_dirs.add(pattern[:-2])
+        elif '/' not in pattern:
+            if _is_literal(pattern):
+                literal_names.add(pattern)
+            else:
+                name_globs.append(f"(?:{fnmatch.translate(pattern)})")
+        else:
+            pattern = _normalize_exclude(pattern)
+            path_globs.append(f"(?:{fnmatch.translate(pattern)})")
+            if pattern.endswith('/*'):
+                dir_globs.append(f"(?:{fnmatch.translate(pattern[:-2])})")
+    # An empty union would match everything
+    name_re = re.compile("|".join(name_globs) or r"(?!)")
+    path_re = re.compile("|".join(path_globs) or r"(?!)")
+    dir_re = re.compile("|".join(dir_globs) or r"(?!)")
+    return frozenset(literal_dirs), frozenset(literal_names), name_re, path_re, dir_re
+
+
+@functools.lru_cache(maxsize=64)
+def compile_includes(patterns: Tuple[str, ...]) -> Pattern:
+    """Compile file name glob patterns into a single regex union"""
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns) or r"(?!)")
 
 
-def is_text_file(file_path: Path) -> bool:
+def should_exclude_file(file_path: Union[str, Path], exclude_patterns: Iterable[str],
+                        is_dir: bool = False) -> bool:
+    """Check if file should be excluded based on patterns
+    
+    Patterns without a "/" apply to the file's own name; walk_filtered checks
+    each directory by name as it descends, so they prune whole subtrees there.
+    "dir/*" patterns match the directory itself only when is_dir is set, so a
+    plain file named "build" is kept.
+    """
+    literal_dirs, literal_names, name_re, path_re, dir_re = _compile_excludes(tuple(exclude_patterns))
+    path_str = os.fspath(file_path)
+    if os.sep != '/':
+        path_str = path_str.replace(os.sep, '/')
+    parts = path_str.split('/')
+    name = parts.pop()
+    if not literal_dirs.isdisjoint(parts) or name in literal_names:
+        return True
+    if is_dir and name in literal_dirs:
+        return True
+    if name_re.match(name):
+        return True
+    # Prefix with "/" so anchored directory patterns also match at the top level
+    path_str = '/' + path_str.lstrip('/')
+    return bool(path_re.match(path_str) or (is_dir and dir_re.match(path_str)))
+
+
+def walk_filtered(root: Union[str, Path], exclude_patterns: Iterable[str] = (),
+                  include_hidden: bool = True) -> Iterator[os.DirEntry]:
+    """Yield file entries under root, pruning excluded and hidden directories
+    
+    Uses os.scandir so entry types come from the directory listing itself
+    instead of a stat() per entry. Exclude patterns are matched against the
+    path relative to root.
+    """
+    root = os.fspath(root)
+    prefix_len = len(os.path.join(root, ''))
+    patterns = tuple(exclude_patterns)
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if not include_hidden and entry.name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if patterns and should_exclude_file(entry.path[prefix_len:], patterns, is_dir):
+                    continue
+                if is_dir:
+                    stack.append(entry.path)
+                else:
+                    yield entry
+
+
+def is_text_file(file_path: Union[str, Path]) -> bool:
     """Check if file is likely a text file"""
+    path_str = os.fspath(file_path)
     try:
-        # Check file extension
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and mime_type.startswith('text'):
-            return True
-        
-        # Check common text extensions
-        text_extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss', 
-                          '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.log', 
-                          '.ini', '.cfg', '.conf', '.sh', '.bat', '.sql', '.r', '.php',
-                          '.rb', '.go', '.rs', '.swift', '.java', '.c', '.cpp', '.h',
-                          '.cs', '.vue', '.svelte', '.toml', '.dockerfile'}
-        
-        if file_path.suffix.lower() in text_extensions:
-            return True
+        st = os.stat(path_str)
+    except OSError:
+        return False
+    # Keyed on mtime/size so a modified file is re-checked
+    return _is_text_file_cached(path_str, st.st_mtime, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def is_text_by_ext(ext: str) -> Optional[bool]:
+    """Text-ness implied by a lowercase file extension, or None if the file must be read"""
+    # Known text extensions avoid the slower MIME lookup
+    if ext in TEXT_EXTENSIONS:
+        return True
+    if ext in BINARY_EXTENSIONS:
+        return False
+    mime_type, _ = _MIME_TYPES.guess_type('x' + ext, strict=False)
+    if mime_type and mime_type.startswith('text'):
+        return True
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_text_file_cached(path_str: str, mtime: float, size: int) -> bool:
+    """Cached text detection for a file at a given mtime/size"""
+    try:
+        known = is_text_by_ext(os.path.splitext(path_str)[1].lower())
+        if known is not None:
+            return known
         
         # Try reading first few bytes
-        if file_path.stat().st_size > 1024 * 1024:  # Skip files larger than 1MB
+        if size > 1024 * 1024:  # Skip files larger than 1MB
             return False
-            
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-            if b'\0' in chunk:  # Binary file
-                return False
-        return True
+        
+        fd = os.open(path_str, _SNIFF_FLAGS)
+        try:
+            chunk = os.read(fd, 512)
+        finally:
+            os.close(fd)
+        return b'\0' not in chunk  # NUL byte means binary
     except:
         return False
 
 
+is_text_file.cache_clear = _is_text_file_cached.cache_clear
+
+
+def decode_text(data: Union[bytes, bytearray, memoryview, mmap.mmap],
+                errors: str = 'strict') -> str:
+    """Decode UTF-8 file contents with universal newlines, like text-mode open()
+    
+    Accepts any buffer, so a memory map is decoded without an intermediate bytes copy.
+    """
+    text = str(data, 'utf-8', errors)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def read_fd(fd: int, size: int) -> bytes:
+    """Read a whole file from offset 0, usually in a single read call"""
+    read = os.pread if _HAS_PREAD else lambda fd, n, offset: os.read(fd, n)
+    # One byte more than the expected size, so a file that grew is noticed
+    data = read(fd, size + 1, 0)
+    if 0 < len(data) <= size:
+        return data  # Short read on a regular file means EOF
+    chunks = [data]
+    offset = len(data)
+    while data:
+        data = read(fd, 65536, offset)
+        offset += len(data)
+        chunks.append(data)
+    return b''.join(chunks)
+
+
+def count_lines(text: str) -> int:
+    """Count lines the way splitlines() does for newline-normalized text"""
+    return text.count('\n') + (1 if text and not text.endswith('\n') else 0)
+
+
+def line_span(text: str, start_idx: int, end_idx: int) -> Tuple[int, int]:
+    """Character offsets covering 0-based lines start_idx up to (not including) end_idx
+    
+    Lets line edits splice the text with two slices instead of splitting it
+    into one string per line. Offsets past the last line clamp to len(text).
+    """
+    def advance(pos: int, lines: int) -> int:
+        for _ in range(lines):
+            pos = text.find('\n', pos) + 1
+            if not pos:
+                return len(text)
+        return pos
+    
+    start_off = advance(0, max(0, start_idx))
+    end_off = advance(start_off, end_idx - start_idx) if end_idx > start_idx else start_off
+    return start_off, end_off
+
+
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
     if size_bytes < 1024:
         return f"{size_bytes} bytes"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    else:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def validate_path(path_str: str) -> Path:
     """Validate and resolve a file path"""
-    path = Path(path_str).expanduser().resolve()
-    return path
+    return Path(validate_path_str(path_str))
+
+
+def validate_path_str(path_str: str) -> str:
+    """Validate and resolve a file path, returning a plain string
+    
+    Resolutions are cached, keyed on an lstat of the final component:
+    replacing or retargeting a symlink there is seen on the next call.
+    Retargeting a symlinked parent directory is not; call cache_clear()
+    after doing that.
+    """
+    path_str = os.fspath(path_str)
+    expanded = os.path.expanduser(path_str)
+    # Relative paths resolve against the current directory, so it is part of the key
+    cwd = None if os.path.isabs(expanded) else os.getcwd()
+    try:
+        st = os.lstat(expanded)
+    except (OSError, ValueError):
+        link_key = None
+    else:
+        # A new symlink has a new ctime even if its inode number is reused
+        link_key = (st.st_dev, st.st_ino, st.st_ctime_ns if stat.S_ISLNK(st.st_mode) else 0)
+    return _validate_path_cached(expanded, cwd, link_key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_path_cached(path_str: str, cwd: Optional[str],
+                          link_key: Optional[Tuple[int, int, int]]) -> str:
+    """Cached path resolution"""
+    return os.path.realpath(path_str)
+
+
+validate_path.cache_clear = validate_path_str.cache_clear = _validate_path_cached.cache_clear
+
+
+def _copy_file_range(src: str, dst: str) -> None:
+    """Copy file contents in the kernel with os.copy_file_range"""
+    flags = getattr(os, 'O_CLOEXEC', 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        remaining = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o666)
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def copy_file_fast(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy a file with its metadata, keeping the data copy in the kernel when possible
+    
+    Tries os.copy_file_range (which can reflink on CoW filesystems), then
+    shutil.copyfile (sendfile on Linux, fcopyfile on macOS), and finally
+    shutil.copy2 if either step fails. Like shutil.copyfile, refuses a
+    directory or special file as src and a dst that is src itself, before
+    dst is opened (and truncated).
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    src_st = os.stat(src)
+    if stat.S_ISDIR(src_st.st_mode):
+        raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), src)
+    if not stat.S_ISREG(src_st.st_mode):
+        raise shutil.SpecialFileError(f"`{src}` is not a regular file")
+    try:
+        dst_st = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if os.path.samestat(src_st, dst_st):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    try:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                _copy_file_range(src, dst)
+            except OSError as e:
+                # Cross-device or unsupported filesystem
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                shutil.copyfile(src, dst)
+        else:
+            shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 
 def get_relative_path(file_path: Path, base_path: Path) -> str:
@@ -0,0 +1,47 @@
+"""
+JSON serialization for data models.
+
+Uses orjson when it is installed and falls back to the standard library.
+Both paths produce the same document.
+"""
+
+import json
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from pathlib import PurePath
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert objects the encoder does not handle natively"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: nested models come back through this hook
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def serialize(obj: Any, indent: bool = False) -> bytes:
+    """Serialize a model (or any JSON-compatible structure) to UTF-8 JSON
+    
+    With indent=True the document is pretty-printed with two spaces.
+    """
+    if orjson is not None:
+        # Route dataclasses through _default so to_dict() key names are kept
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        return json.dumps(obj, default=_default, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
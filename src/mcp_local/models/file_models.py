@@ -2,13 +2,17 @@
 Data models for file operations.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+# slots=True needs Python 3.10+; older versions keep a per-instance __dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FileInfo:
     """Information about a file."""
     path: Path
@@ -30,7 +34,7 @@ class FileInfo:
         return self.path.suffix.lower()
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EditRecord:
     """Record of a file edit operation."""
     timestamp: datetime
@@ -50,7 +54,7 @@ class EditRecord:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchMatch:
     """A single search match result."""
     file_path: str
@@ -72,15 +76,15 @@ class SearchMatch:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchResults:
     """Collection of search results."""
     search_term: str
-    matches: List[SearchMatch]
-    files_searched: int
-    files_with_matches: int
-    search_path: str
-    options: Dict[str, Any]
+    matches: List[SearchMatch] = field(default_factory=list)
+    files_searched: int = 0
+    files_with_matches: int = 0
+    search_path: str = "."
+    options: Dict[str, Any] = field(default_factory=dict)
     
     @property
     def total_matches(self) -> int:
@@ -89,15 +93,13 @@ class SearchResults:
     
     def group_by_file(self) -> Dict[str, List[SearchMatch]]:
         """Group matches by file."""
-        grouped = {}
+        grouped: Dict[str, List[SearchMatch]] = {}
         for match in self.matches:
-            if match.file_path not in grouped:
-                grouped[match.file_path] = []
-            grouped[match.file_path].append(match)
+            grouped.setdefault(match.file_path, []).append(match)
         return grouped
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ReplaceResult:
     """Result of a find and replace operation."""
     file_path: str
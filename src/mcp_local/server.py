@@ -2,17 +2,23 @@
 Main MCP Local server implementation with system tools
 """
 
-from mcp.server.fastmcp import FastMCP
+from typing import TYPE_CHECKING
 
-from .tools.file_operations import register_file_operations
-from .tools.file_editing import register_file_editing_tools
-from .tools.search_tools import register_search_tools
-from .tools.system_tools import register_system_tools
 from .services import backup_service, history_service, file_service
 
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
 
-def create_server(name: str = "mcp-local") -> FastMCP:
+
+def create_server(name: str = "mcp-local") -> "FastMCP":
     """Create and configure the MCP Local server"""
+    # Imported here so the mcp package and tool modules load only when a server is built
+    from mcp.server.fastmcp import FastMCP
+    
+    from .tools.file_operations import register_file_operations
+    from .tools.file_editing import register_file_editing_tools
+    from .tools.search_tools import register_search_tools
+    from .tools.system_tools import register_system_tools
     
     # Create the FastMCP server
     mcp = FastMCP(name)
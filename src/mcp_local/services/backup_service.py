@@ -3,12 +3,14 @@ Backup service for managing file backups
 """
 
 import datetime
+import os
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from ..core import ServiceBase, BACKUP_DIR
 from ..core.exceptions import BackupError
+from ..core.utils import copy_file_fast
 
 
 class BackupService(ServiceBase):
@@ -16,14 +18,20 @@ class BackupService(ServiceBase):
     
     def __init__(self):
         self.backup_dir = BACKUP_DIR
-        self.initialize()
+        # Latest backup per file name, so get_latest_backup avoids a directory scan
+        self._latest_backups: Dict[str, str] = {}
+        # The directory is created on first backup rather than at import
+        self._initialized = False
     
     def initialize(self) -> None:
         """Initialize backup service"""
+        if self._initialized:
+            return
         try:
             self.backup_dir.mkdir(exist_ok=True)
         except Exception as e:
             raise BackupError(f"Failed to initialize backup directory: {e}")
+        self._initialized = True
     
     def cleanup(self) -> None:
         """Cleanup old backups if needed"""
@@ -41,7 +49,29 @@ class BackupService(ServiceBase):
             backup_name = f"{path.name}_{timestamp}.backup"
             backup_path = self.backup_dir / backup_name
             
-            shutil.copy2(path, backup_path)
+            self.initialize()
+            copy_file_fast(path, backup_path)
+            self._latest_backups[path.name] = str(backup_path)
+            return str(backup_path)
+        except Exception as e:
+            raise BackupError(f"Failed to create backup: {e}")
+    
+    def create_backup_from_bytes(self, file_path: str, data: bytes) -> str:
+        """Create a backup from file contents the caller has already read
+        
+        Accepts any bytes-like buffer, such as a memoryview over a mapped file.
+        """
+        try:
+            path = Path(file_path).expanduser().resolve()
+            
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = f"{path.name}_{timestamp}.backup"
+            backup_path = self.backup_dir / backup_name
+            
+            self.initialize()
+            backup_path.write_bytes(data)
+            shutil.copystat(path, backup_path)
+            self._latest_backups[path.name] = str(backup_path)
             return str(backup_path)
         except Exception as e:
             raise BackupError(f"Failed to create backup: {e}")
@@ -49,23 +79,31 @@ class BackupService(ServiceBase):
     def list_backups(self, file_name: Optional[str] = None) -> list:
         """List available backups"""
         try:
-            if file_name:
-                pattern = f"{file_name}_*.backup"
-                backups = list(self.backup_dir.glob(pattern))
-            else:
-                backups = list(self.backup_dir.glob("*.backup"))
+            prefix = f"{file_name}_" if file_name else ""
+            try:
+                it = os.scandir(self.backup_dir)
+            except FileNotFoundError:
+                return []  # No backup has been made yet
+            with it:
+                entries = [e for e in it if e.name.endswith('.backup') and e.name.startswith(prefix)]
             
             # Sort by modification time (newest first)
-            backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            return [str(backup) for backup in backups]
+            entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+            return [os.path.join(self.backup_dir, e.name) for e in entries]
         except Exception as e:
             raise BackupError(f"Failed to list backups: {e}")
     
     def get_latest_backup(self, file_name: str) -> Optional[str]:
         """Get the most recent backup for a file"""
         try:
+            cached = self._latest_backups.get(file_name)
+            if cached and os.path.exists(cached):
+                return cached
             backups = self.list_backups(file_name)
-            return backups[0] if backups else None
+            if not backups:
+                return None
+            self._latest_backups[file_name] = backups[0]
+            return backups[0]
         except Exception as e:
             raise BackupError(f"Failed to get latest backup: {e}")
     
@@ -89,6 +127,7 @@ class BackupService(ServiceBase):
             backup = Path(backup_path)
             if backup.exists():
                 backup.unlink()
+                self._latest_backups.clear()
                 return True
             return False
         except Exception as e:
@@ -2,20 +2,79 @@
 File service for managing file operations
 """
 
+import builtins
+import contextlib
 import json
+import mmap
 import os
+import shutil
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
-from ..core import ServiceBase, MAX_FILE_SIZE
+from ..core import ServiceBase, MAX_FILE_SIZE, bufferpool
 from ..core.exceptions import FileNotFoundError, FileSizeError, FileAccessError
-from ..core.utils import format_file_size, validate_path
+from ..core.utils import (
+    READ_FLAGS, copy_file_fast, decode_text, format_file_size, read_fd, validate_path,
+    validate_path_str
+)
+
+_CLOEXEC = getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _CLOEXEC
+
+# Number of directory listings kept by list_directory
+_DIR_CACHE_SIZE = 256
+_DIR_CACHE_SETTLE_NS = 2 * 10**9
+# Editing a file in place leaves its directory's mtime alone, so a cached
+# listing (sizes, modified times) is only served for this long
+_DIR_CACHE_TTL_NS = 2 * 10**9
+
+# Files at least this large are decoded from a memory map
+_MMAP_THRESHOLD = 64 * 1024
+
+# Read descriptors kept open between calls. Positional reads don't move the
+# file offset, so a cached descriptor needs no seek; without them (Windows)
+# every read opens the file afresh.
+_FD_CACHE_SIZE = 64
+_HAS_PREAD = hasattr(os, 'pread') and hasattr(os, 'preadv')
+
+
+def _read_small_pooled(fd: int, size: int) -> Optional[str]:
+    """Read and decode a small file through a pooled buffer
+    
+    Returns None if the file changed size since it was checked, so the
+    caller can fall back to a plain read.
+    """
+    buf = bufferpool.rent(size + 1)
+    try:
+        n = os.preadv(fd, [buf], 0)
+        if not 0 < n <= size:
+            return None
+        with memoryview(buf) as view, view[:n] as chunk:
+            return decode_text(chunk)
+    finally:
+        bufferpool.give_back(buf)
+
+
+def _encode_text(content: str) -> bytes:
+    """Encode text the way write_file stores it"""
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
 
 
 class FileService(ServiceBase):
     """Service for file operations and management"""
     
     def __init__(self):
+        # (path, show_hidden, include_size) -> (directory mtime_ns, items), in LRU order
+        self._dir_cache: "OrderedDict[Tuple[str, bool, bool], Tuple[int, int, List[dict]]]" = OrderedDict()
+        # path -> (fd, st_dev, st_ino) of cached read descriptors, in LRU order
+        self._fd_cache: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
+        self._fd_lock = threading.Lock()
         self.initialize()
     
     def initialize(self) -> None:
@@ -24,28 +83,27 @@ class FileService(ServiceBase):
     
     def cleanup(self) -> None:
         """Cleanup resources"""
-        pass
+        with self._fd_lock:
+            cached = list(self._fd_cache.values())
+            self._fd_cache.clear()
+        for fd, _, _ in cached:
+            os.close(fd)
     
-    def read_file(self, file_path: str, max_size: Optional[int] = None) -> str:
-        """Read contents of a text file"""
+    def read_file(self, file_path: Union[str, Path], max_size: Optional[int] = None) -> str:
+        """Read contents of a text file (a path string or an already-resolved Path)"""
         try:
-            path = validate_path(file_path)
-            
-            if not path.exists():
-                raise FileNotFoundError(f"File '{file_path}' does not exist")
-            
-            # Check file size
-            file_size = path.stat().st_size
-            size_limit = max_size or MAX_FILE_SIZE
-            
-            if file_size > size_limit:
-                raise FileSizeError(f"File too large ({format_file_size(file_size)}). "
-                                  f"Limit: {format_file_size(size_limit)}")
-            
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return content
+            with self._open_for_read(file_path, max_size) as (fd, file_size):
+                if file_size >= _MMAP_THRESHOLD:
+                    # Decode straight from the page cache, skipping the bytes copy
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        return decode_text(mm)
+                if file_size < bufferpool.MAX_POOLED_SIZE and _HAS_PREAD:
+                    text = _read_small_pooled(fd, file_size)
+                    if text is not None:
+                        return text
+                data = read_fd(fd, file_size)
+            
+            return decode_text(data)
             
         except (FileNotFoundError, FileSizeError):
             raise
@@ -56,17 +114,110 @@ class FileService(ServiceBase):
         except Exception as e:
             raise FileAccessError(f"Error reading file '{file_path}': {e}")
     
-    def write_file(self, file_path: str, content: str, create_dirs: bool = True) -> bool:
-        """Write content to a file"""
+    def read_file_bytes(self, file_path: Union[str, Path], max_size: Optional[int] = None) -> bytes:
+        """Read the raw contents of a file"""
         try:
-            path = validate_path(file_path)
-            
-            if create_dirs:
-                path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with self._open_for_read(file_path, max_size) as (fd, file_size):
+                return read_fd(fd, file_size)
             
+        except (FileNotFoundError, FileSizeError):
+            raise
+        except PermissionError:
+            raise FileAccessError(f"Permission denied accessing '{file_path}'")
+        except Exception as e:
+            raise FileAccessError(f"Error reading file '{file_path}': {e}")
+    
+    @contextlib.contextmanager
+    def _open_for_read(self, file_path: Union[str, Path],
+                       max_size: Optional[int]) -> Iterator[Tuple[int, int]]:
+        """Open a file for reading and check its size, yielding the descriptor and size
+        
+        Where positional reads are available the descriptor comes from (and
+        goes back to) a small cache, checked against the path's current
+        device and inode so a replaced file is reopened.
+        """
+        path = validate_path_str(file_path)
+        size_limit = max_size or MAX_FILE_SIZE
+        
+        try:
+            if _HAS_PREAD:
+                st = os.stat(path)
+                fd = self._checkout_fd(path, st)
+                if fd is None:
+                    fd = os.open(path, READ_FLAGS)
+                    st = os.fstat(fd)
+            else:
+                # open + fstat on one descriptor instead of exists/stat/open
+                fd = os.open(path, READ_FLAGS)
+                st = os.fstat(fd)
+        except builtins.FileNotFoundError:
+            raise FileNotFoundError(f"File '{file_path}' does not exist")
+        
+        try:
+            # Check file size
+            if st.st_size > size_limit:
+                raise FileSizeError(f"File too large ({format_file_size(st.st_size)}). "
+                                  f"Limit: {format_file_size(size_limit)}")
+            yield fd, st.st_size
+        except BaseException:
+            os.close(fd)
+            raise
+        if _HAS_PREAD:
+            self._checkin_fd(path, fd, st)
+        else:
+            os.close(fd)
+    
+    def _checkout_fd(self, path: str, st: os.stat_result) -> Optional[int]:
+        """Take a cached read descriptor for path if it still refers to the same file"""
+        with self._fd_lock:
+            cached = self._fd_cache.pop(path, None)
+        if cached is None:
+            return None
+        fd, dev, ino = cached
+        if (dev, ino) == (st.st_dev, st.st_ino):
+            return fd
+        os.close(fd)
+        return None
+    
+    def _checkin_fd(self, path: str, fd: int, st: os.stat_result) -> None:
+        """Return a read descriptor to the cache, closing the least recently used"""
+        with self._fd_lock:
+            previous = self._fd_cache.pop(path, None)
+            self._fd_cache[path] = (fd, st.st_dev, st.st_ino)
+            evicted = self._fd_cache.popitem(last=False)[1] if len(self._fd_cache) > _FD_CACHE_SIZE else None
+        for entry in (previous, evicted):
+            if entry is not None:
+                os.close(entry[0])
+    
+    def _drop_fd(self, path: Union[str, Path]) -> None:
+        """Close any cached read descriptor for path"""
+        with self._fd_lock:
+            cached = self._fd_cache.pop(os.fspath(path), None)
+        if cached is not None:
+            os.close(cached[0])
+    
+    def write_file(self, file_path: Union[str, Path], content: str, create_dirs: bool = True) -> bool:
+        """Write content to a file (a path string or an already-resolved Path)"""
+        try:
+            path = validate_path_str(file_path)
+            data = _encode_text(content)
+            
+            try:
+                fd = os.open(path, _WRITE_FLAGS, 0o666)
+            except builtins.FileNotFoundError:
+                if not create_dirs:
+                    raise
+                # Only pay for mkdir when the parent is actually missing
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd = os.open(path, _WRITE_FLAGS, 0o666)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            
+            self._invalidate_dir(path)
             return True
             
         except PermissionError:
@@ -74,6 +225,29 @@ class FileService(ServiceBase):
         except Exception as e:
             raise FileAccessError(f"Error writing file '{file_path}': {e}")
     
+    def has_content(self, file_path: Union[str, Path], content: str) -> bool:
+        """Check whether a file already holds exactly what write_file would store
+        
+        Sizes are compared first; only a same-sized file is mapped and compared.
+        """
+        data = _encode_text(content)
+        try:
+            fd = os.open(validate_path_str(file_path), READ_FLAGS)
+        except OSError:
+            return False
+        try:
+            size = os.fstat(fd).st_size
+            if size != len(data):
+                return False
+            if not size:
+                return True
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return view == data
+        except (OSError, ValueError):
+            return False
+        finally:
+            os.close(fd)
+    
     def get_file_info(self, file_path: str) -> dict:
         """Get detailed information about a file"""
         try:
@@ -106,43 +280,70 @@ class FileService(ServiceBase):
     
     def list_directory(self, directory: str, show_hidden: bool = False, 
                       include_size: bool = True) -> List[dict]:
-        """List contents of a directory"""
+        """List contents of a directory
+        
+        Results are cached per directory and reused while its mtime is
+        unchanged, for at most _DIR_CACHE_TTL_NS; the returned list must not
+        be modified.
+        """
         try:
-            path = validate_path(directory)
+            path = validate_path_str(directory)
             
-            if not path.exists():
+            try:
+                dir_stat = os.stat(path)
+            except builtins.FileNotFoundError:
                 raise FileNotFoundError(f"Directory '{directory}' does not exist")
             
-            if not path.is_dir():
+            if not stat_module.S_ISDIR(dir_stat.st_mode):
                 raise FileAccessError(f"'{directory}' is not a directory")
             
+            key = (path, show_hidden, include_size)
+            cached = self._dir_cache.get(key)
+            now = time.monotonic_ns()
+            if (cached is not None and cached[0] == dir_stat.st_mtime_ns
+                    and now - cached[1] < _DIR_CACHE_TTL_NS):
+                self._dir_cache.move_to_end(key)
+                return cached[2]
+            
             items = []
-            for item in path.iterdir():
-                if not show_hidden and item.name.startswith('.'):
-                    continue
-                
-                try:
-                    stat = item.stat()
-                    item_info = {
-                        "name": item.name,
-                        "path": str(item),
-                        "is_file": item.is_file(),
-                        "is_dir": item.is_dir(),
-                        "modified_time": stat.st_mtime
-                    }
-                    
-                    if include_size and item.is_file():
-                        item_info["size"] = stat.st_size
-                        item_info["size_formatted"] = format_file_size(stat.st_size)
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not show_hidden and entry.name.startswith('.'):
+                        continue
                     
-                    items.append(item_info)
-                except (PermissionError, OSError):
-                    # Skip files we can't access
-                    continue
+                    try:
+                        # One stat per entry; the types come from its mode rather than
+                        # is_file()/is_dir(), which stat again for symlinks
+                        stat = entry.stat()
+                        is_file = stat_module.S_ISREG(stat.st_mode)
+                        item_info = {
+                            "name": entry.name,
+                            "path": entry.path,
+                            "is_file": is_file,
+                            "is_dir": stat_module.S_ISDIR(stat.st_mode),
+                            "modified_time": stat.st_mtime
+                        }
+                        
+                        if include_size and is_file:
+                            item_info["size"] = stat.st_size
+                            item_info["size_formatted"] = format_file_size(stat.st_size)
+                        
+                        items.append(item_info)
+                    except (PermissionError, OSError):
+                        # Skip files we can't access
+                        continue
             
             # Sort: directories first, then files, both alphabetically
             items.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
             
+            # A directory modified within the timestamp granularity could change
+            # again without its mtime moving, so only settled listings are cached
+            if time.time_ns() - dir_stat.st_mtime_ns > _DIR_CACHE_SETTLE_NS:
+                self._dir_cache[key] = (dir_stat.st_mtime_ns, now, items)
+                self._dir_cache.move_to_end(key)
+                if len(self._dir_cache) > _DIR_CACHE_SIZE:
+                    self._dir_cache.popitem(last=False)
+            
             return items
             
         except (FileNotFoundError, FileAccessError):
@@ -150,6 +351,13 @@ class FileService(ServiceBase):
         except Exception as e:
             raise FileAccessError(f"Error listing directory '{directory}': {e}")
     
+    def _invalidate_dir(self, path: Union[str, Path]) -> None:
+        """Drop cached listings of the directory containing path"""
+        parent = os.path.dirname(os.fspath(path))
+        for show_hidden in (False, True):
+            for include_size in (False, True):
+                self._dir_cache.pop((parent, show_hidden, include_size), None)
+    
     def delete_file(self, file_path: str) -> bool:
         """Delete a file"""
         try:
@@ -165,6 +373,10 @@ class FileService(ServiceBase):
             else:
                 raise FileAccessError(f"Cannot delete '{file_path}': unsupported file type")
             
+            self._drop_fd(path)
+            self._invalidate_dir(path)
+            # Cached resolutions through a removed symlink or directory are stale
+            validate_path.cache_clear()
             return True
             
         except FileNotFoundError:
@@ -181,8 +393,6 @@ class FileService(ServiceBase):
     def copy_file(self, src_path: str, dst_path: str) -> bool:
         """Copy a file"""
         try:
-            import shutil
-            
             src = validate_path(src_path)
             dst = validate_path(dst_path)
             
@@ -192,7 +402,10 @@ class FileService(ServiceBase):
             # Create destination directory if needed
             dst.parent.mkdir(parents=True, exist_ok=True)
             
-            shutil.copy2(src, dst)
+            if dst.is_dir():
+                dst = dst / src.name
+            copy_file_fast(src, dst)
+            self._invalidate_dir(dst)
             return True
             
         except FileNotFoundError:
@@ -205,8 +418,6 @@ class FileService(ServiceBase):
     def move_file(self, src_path: str, dst_path: str) -> bool:
         """Move/rename a file"""
         try:
-            import shutil
-            
             src = validate_path(src_path)
             dst = validate_path(dst_path)
             
@@ -216,7 +427,18 @@ class FileService(ServiceBase):
             # Create destination directory if needed
             dst.parent.mkdir(parents=True, exist_ok=True)
             
-            shutil.move(src, dst)
+            if dst.is_dir():
+                dst = dst / src.name
+            try:
+                # Same filesystem: a metadata-only rename
+                os.rename(src, dst)
+            except OSError:
+                shutil.move(src, dst)
+            self._drop_fd(src)
+            self._invalidate_dir(src)
+            self._invalidate_dir(dst)
+            # Cached resolutions through the moved path are stale
+            validate_path.cache_clear()
             return True
             
         except FileNotFoundError:
@@ -3,17 +3,37 @@ History service for tracking file edit operations
 """
 
 import datetime
-from typing import Dict, List, Optional
+import time
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional
 
-from ..core import ServiceBase, MAX_EDIT_HISTORY_ENTRIES
+from ..core.base import ServiceBase
+from ..core.config import MAX_EDIT_HISTORY_ENTRIES
+from ..models._serialize import serialize
+
+
+_DAY_NS = 86_400 * 1_000_000_000
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Format a history timestamp (nanoseconds since the epoch) as local ISO time"""
+    return datetime.datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
 
 
 class HistoryService(ServiceBase):
     """Service for tracking and managing edit history"""
     
     def __init__(self):
-        self.edit_history: List[Dict] = []
         self.max_entries = MAX_EDIT_HISTORY_ENTRIES
+        # Bounded ring: appending past max_entries drops the oldest entry in O(1)
+        self.edit_history: Deque[Dict] = deque(maxlen=self.max_entries)
+        # Indexes kept in step with edit_history so queries don't rescan it
+        self._by_file: Dict[str, Deque[Dict]] = {}
+        self._action_counts: Counter = Counter()
+        self._file_counts: Counter = Counter()
+        # Files in history, most recently edited last
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
         self.initialize()
     
     def initialize(self) -> None:
@@ -23,40 +43,57 @@ class HistoryService(ServiceBase):
     
     def cleanup(self) -> None:
         """Cleanup old history entries"""
-        # Trim history to max entries
-        if len(self.edit_history) > self.max_entries:
-            self.edit_history = self.edit_history[-self.max_entries:]
+        # The deque is bounded by max_entries, so there is nothing to trim
+        pass
     
     def log_edit(self, action: str, file_path: str, details: dict) -> None:
         """Log a file editing action"""
-        timestamp = datetime.datetime.now().isoformat()
         log_entry = {
-            "timestamp": timestamp,
+            "timestamp": time.time_ns(),
             "action": action,
             "file": file_path,
             "details": details
         }
         
-        self.edit_history.append(log_entry)
+        if len(self.edit_history) == self.max_entries:
+            self._unindex(self.edit_history[0])
         
-        # Keep only last max_entries
-        if len(self.edit_history) > self.max_entries:
-            self.edit_history.pop(0)
+        self.edit_history.append(log_entry)
+        self._by_file.setdefault(file_path, deque()).append(log_entry)
+        self._action_counts[action] += 1
+        self._file_counts[file_path] += 1
+        self._recent.pop(file_path, None)
+        self._recent[file_path] = None
+    
+    def _unindex(self, entry: Dict) -> None:
+        """Remove the oldest entry from the indexes before the deque drops it"""
+        file_path = entry['file']
+        file_entries = self._by_file[file_path]
+        file_entries.popleft()
+        if not file_entries:
+            del self._by_file[file_path]
+            del self._recent[file_path]
+        for counts, key in ((self._action_counts, entry['action']), (self._file_counts, file_path)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
     
     def get_history(self, limit: Optional[int] = None, 
                    file_path: Optional[str] = None) -> List[Dict]:
         """Get edit history with optional filtering"""
-        history = self.edit_history
-        
         # Filter by file path if specified
         if file_path:
-            history = [entry for entry in history if entry['file'] == file_path]
+            history = self._by_file.get(file_path, ())
+            if limit:
+                return list(islice(history, max(0, len(history) - limit), None))
+            return list(history)
         
-        # Apply limit
+        # Apply limit without copying the whole ring
         if limit:
-            history = history[-limit:]
+            start = max(0, len(self.edit_history) - limit)
+            return list(islice(self.edit_history, start, None))
         
-        return history
+        return list(self.edit_history)
     
     def get_file_history(self, file_path: str, limit: Optional[int] = None) -> List[Dict]:
         """Get history for a specific file"""
@@ -64,60 +101,52 @@ class HistoryService(ServiceBase):
     
     def get_recent_files(self, limit: int = 10) -> List[str]:
         """Get list of recently edited files"""
-        recent_files = []
-        seen_files = set()
-        
-        # Go through history in reverse order (newest first)
-        for entry in reversed(self.edit_history):
-            file_path = entry['file']
-            if file_path not in seen_files:
-                recent_files.append(file_path)
-                seen_files.add(file_path)
-                
-                if len(recent_files) >= limit:
-                    break
-        
-        return recent_files
+        return list(islice(reversed(self._recent), max(0, limit)))
     
     def clear_history(self) -> None:
         """Clear all edit history"""
         self.edit_history.clear()
+        self._by_file.clear()
+        self._action_counts.clear()
+        self._file_counts.clear()
+        self._recent.clear()
     
     def export_history(self) -> Dict:
         """Export history for backup/analysis"""
         return {
             "export_time": datetime.datetime.now().isoformat(),
             "total_entries": len(self.edit_history),
-            "history": self.edit_history
+            "history": [dict(entry, timestamp=format_timestamp(entry['timestamp']))
+                        for entry in self.edit_history]
         }
     
+    def export_history_json(self) -> str:
+        """Export history as a JSON document"""
+        return serialize(self.export_history()).decode('utf-8')
+    
     def get_stats(self) -> Dict:
         """Get statistics about edit history"""
         if not self.edit_history:
             return {"total_edits": 0}
         
-        # Count actions
-        action_counts = {}
-        file_counts = {}
-        
-        for entry in self.edit_history:
-            action = entry['action']
-            file_path = entry['file']
-            
-            action_counts[action] = action_counts.get(action, 0) + 1
-            file_counts[file_path] = file_counts.get(file_path, 0) + 1
-        
         # Most edited files
-        most_edited = sorted(file_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        most_edited = self._file_counts.most_common(5)
         
         return {
             "total_edits": len(self.edit_history),
-            "action_counts": action_counts,
+            "action_counts": dict(self._action_counts),
             "most_edited_files": most_edited,
-            "recent_activity": len([e for e in self.edit_history 
-                                  if (datetime.datetime.now() - 
-                                     datetime.datetime.fromisoformat(e['timestamp'])).days < 1])
+            "recent_activity": self._count_since(time.time_ns() - _DAY_NS)
         }
+    
+    def _count_since(self, cutoff_ns: int) -> int:
+        """Count entries logged after cutoff_ns, walking back from the newest"""
+        count = 0
+        for entry in reversed(self.edit_history):
+            if entry['timestamp'] <= cutoff_ns:
+                break
+            count += 1
+        return count
 
 
 # Global history service instance  
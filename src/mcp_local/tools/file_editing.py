@@ -2,15 +2,95 @@
 Advanced file editing tools
 """
 
+import io
 import re
 import difflib
-from typing import Optional
+import functools
+import shutil
+import subprocess
+from typing import Optional, Pattern, Tuple
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core import FileOperationBase
+from ..core import COMMAND_TIMEOUT, MAX_FILE_SIZE, FileOperationBase, register_tool
+from ..core.utils import count_lines, decode_text, line_span
 from ..services import file_service, backup_service, history_service
+from ..services.history_service import format_timestamp
+
+
+try:
+    import re2  # google-re2: linear-time matching, no catastrophic backtracking
+except ImportError:  # optional dependency
+    re2 = None
+
+
+# Pattern text RE2 reads differently from re: letter/digit escapes (\d \w \s \b
+# are ASCII-only in RE2, \p and \x{..} exist only there), POSIX [:classes:],
+# inline flags and lookaround, "$" (re also matches before a final newline)
+# and "{,n}" (a literal in RE2)
+_RE2_UNSAFE = re.compile(r'\\[A-Za-z0-9]|\$|\[:|\(\?(?!:)|\{,')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, allow_re2: bool = True) -> Pattern:
+    """Compile a replace pattern, reusing it across calls
+    
+    Uses RE2 (the optional google-re2 dependency) only for patterns it
+    matches exactly like the standard re module, so results don't depend on
+    whether it is installed. Anything else, including patterns RE2 rejects,
+    is compiled with re.
+    """
+    if allow_re2 and re2 is not None and not _RE2_UNSAFE.search(pattern):
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+def _regex_subn(pattern: str, repl: str, text: str) -> Tuple[str, int]:
+    """Replace every match of pattern in text in a single pass, returning (text, count)
+    
+    Templates with backslashes (group references, escapes) are expanded by
+    re: RE2's expansion mangles non-ASCII text and accepts bad escapes. A
+    literal replacement is passed to RE2 as a function, so nothing is expanded.
+    """
+    literal = '\\' not in repl
+    regex = _compile_pattern(pattern, literal)
+    if literal and not isinstance(regex, re.Pattern):
+        return regex.subn(lambda _: repl, text)
+    return regex.subn(repl, text)
+
+
+@functools.lru_cache(maxsize=None)
+def _diff_executable() -> Optional[str]:
+    """Locate the system diff program, if there is one"""
+    return shutil.which("diff")
+
+
+def _run_diff(old_path: Path, new_path: Path, old_label: str, new_label: str,
+              context_lines: int = 3) -> Optional[str]:
+    """Unified diff of two files via the system diff
+    
+    Returns None when diff is unavailable or fails, so the caller can fall
+    back to difflib.
+    """
+    diff_exe = _diff_executable()
+    if not diff_exe:
+        return None
+    try:
+        result = subprocess.run(
+            [diff_exe, f"-U{max(0, context_lines)}", "--label", old_label, "--label", new_label,
+             str(old_path), str(new_path)],
+            capture_output=True, encoding="utf-8", errors="replace", timeout=COMMAND_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Exit status 0 means identical, 1 means different, anything else is trouble
+    if result.returncode not in (0, 1):
+        return None
+    return result.stdout
 
 
 class EditFileLinesTool(FileOperationBase):
@@ -25,33 +105,36 @@ class EditFileLinesTool(FileOperationBase):
             if not path.exists():
                 return f"File '{file_path}' does not exist"
             
-            # Create backup
-            backup_path = backup_service.create_backup(str(path))
-            
             # Read current content
-            content = file_service.read_file(file_path)
-            lines = content.splitlines(keepends=True)
+            raw = file_service.read_file_bytes(file_path)
+            content = decode_text(raw)
             
-            total_lines = len(lines)
+            total_lines = count_lines(content)
             start_idx = start_line - 1
             end_idx = end_line if end_line else start_line
             
             if start_idx < 0 or start_idx >= total_lines:
                 return f"Invalid line number {start_line}. File has {total_lines} lines"
             
+            start_off, end_off = line_span(content, start_idx, end_idx)
+            
             # Store original content for logging
-            original_lines = lines[start_idx:end_idx]
+            original_lines = content[start_off:end_off].splitlines(keepends=True)
             
-            # Replace lines
-            new_lines = new_content.splitlines(keepends=True)
+            # Replace lines, terminating the last one before the split
             if new_content and not new_content.endswith('\n'):
-                if new_lines:
-                    new_lines[-1] += '\n'
+                new_content += '\n'
+            new_lines = new_content.splitlines(keepends=True)
             
-            lines[start_idx:end_idx] = new_lines
+            # Unchanged lines need neither a backup nor a write
+            if new_lines == original_lines:
+                return f"Lines {start_line}-{end_line or start_line} in '{path}' are unchanged"
+            
+            # Create backup
+            backup_path = backup_service.create_backup_from_bytes(str(path), raw)
             
             # Write back to file
-            new_file_content = ''.join(lines)
+            new_file_content = content[:start_off] + new_content + content[end_off:]
             file_service.write_file(file_path, new_file_content)
             
             # Log the edit
@@ -81,24 +164,21 @@ class InsertLinesTool(FileOperationBase):
             if not path.exists():
                 return f"File '{file_path}' does not exist"
             
-            backup_path = backup_service.create_backup(str(path))
+            # Read current content once; the backup is written from the same bytes
+            raw = file_service.read_file_bytes(file_path)
+            file_content = decode_text(raw)
+            backup_path = backup_service.create_backup_from_bytes(str(path), raw)
             
-            # Read current content
-            file_content = file_service.read_file(file_path)
-            lines = file_content.splitlines(keepends=True)
-            
-            insert_idx = max(0, min(line_number - 1, len(lines)))
-            new_lines = content.splitlines(keepends=True)
+            insert_idx = max(0, min(line_number - 1, count_lines(file_content)))
+            insert_off = line_span(file_content, insert_idx, insert_idx)[0]
             
             # Ensure proper line endings
             if content and not content.endswith('\n'):
-                if new_lines:
-                    new_lines[-1] += '\n'
-            
-            lines[insert_idx:insert_idx] = new_lines
+                content += '\n'
+            new_lines = content.splitlines(keepends=True)
             
             # Write back to file
-            new_file_content = ''.join(lines)
+            new_file_content = file_content[:insert_off] + content + file_content[insert_off:]
             file_service.write_file(file_path, new_file_content)
             
             history_service.log_edit("insert_lines", str(path), {
@@ -125,24 +205,23 @@ class DeleteLinesTool(FileOperationBase):
             if not path.exists():
                 return f"File '{file_path}' does not exist"
             
-            backup_path = backup_service.create_backup(str(path))
+            # Read current content once; the backup is written from the same bytes
+            raw = file_service.read_file_bytes(file_path)
+            file_content = decode_text(raw)
+            backup_path = backup_service.create_backup_from_bytes(str(path), raw)
             
-            # Read current content
-            file_content = file_service.read_file(file_path)
-            lines = file_content.splitlines(keepends=True)
-            
-            total_lines = len(lines)
+            total_lines = count_lines(file_content)
             start_idx = start_line - 1
             end_idx = end_line if end_line else start_line
             
             if start_idx < 0 or start_idx >= total_lines:
                 return f"Invalid line number {start_line}. File has {total_lines} lines"
             
-            deleted_lines = lines[start_idx:end_idx]
-            del lines[start_idx:end_idx]
+            start_off, end_off = line_span(file_content, start_idx, end_idx)
+            deleted_lines = file_content[start_off:end_off].splitlines(keepends=True)
             
             # Write back to file
-            new_file_content = ''.join(lines)
+            new_file_content = file_content[:start_off] + file_content[end_off:]
             file_service.write_file(file_path, new_file_content)
             
             history_service.log_edit("delete_lines", str(path), {
@@ -170,21 +249,26 @@ class ReplaceInFileTool(FileOperationBase):
             if not path.exists():
                 return f"File '{file_path}' does not exist"
             
-            backup_path = backup_service.create_backup(str(path))
-            
             # Read current content
-            content = file_service.read_file(file_path)
-            original_content = content
+            raw = file_service.read_file_bytes(file_path)
+            content = decode_text(raw)
             
             if use_regex:
                 try:
-                    content = re.sub(search_pattern, replace_with, content)
-                    count = len(re.findall(search_pattern, original_content))
+                    # Replace and count in a single pass
+                    content, count = _regex_subn(search_pattern, replace_with, content)
                 except re.error as e:
                     return f"Invalid regex pattern: {e}"
             else:
                 count = content.count(search_pattern)
-                content = content.replace(search_pattern, replace_with)
+                if count and search_pattern != replace_with:
+                    content = content.replace(search_pattern, replace_with)
+            
+            # Nothing matched: leave the file alone and skip the backup
+            if not count:
+                return f"No replacements made in '{path}'"
+            
+            backup_path = backup_service.create_backup_from_bytes(str(path), raw)
             
             # Write back to file
             file_service.write_file(file_path, content)
@@ -209,7 +293,7 @@ class GetFileDiffTool(FileOperationBase):
     def __init__(self):
         super().__init__("get_file_diff", "Show differences between current file and its backup")
     
-    def execute(self, file_path: str, backup_file: Optional[str] = None) -> str:
+    def execute(self, file_path: str, backup_file: Optional[str] = None, context_lines: int = 3) -> str:
         try:
             path = self.validate_file_path(file_path)
             if not path.exists():
@@ -227,25 +311,37 @@ class GetFileDiffTool(FileOperationBase):
             if not backup_path.exists():
                 return f"Backup file '{backup_path}' does not exist"
             
+            fromfile = f"{path.name} (backup)"
+            tofile = f"{path.name} (current)"
+            
+            # Prefer the system diff, which compares the files without loading them here
+            if backup_path.stat().st_size <= MAX_FILE_SIZE and path.stat().st_size <= MAX_FILE_SIZE:
+                output = _run_diff(backup_path, path, fromfile, tofile, context_lines)
+                if output is not None:
+                    if not output:
+                        return "No differences found"
+                    return f"Differences for '{path}':\n\n" + output.rstrip("\n")
+            
             # Read both files
             current_content = file_service.read_file(file_path)
             backup_content = file_service.read_file(str(backup_path))
             
-            current_lines = current_content.splitlines(keepends=True)
-            backup_lines = backup_content.splitlines(keepends=True)
+            # Content is newline-normalized, so readlines() splits exactly on '\n'
+            current_lines = io.StringIO(current_content).readlines()
+            backup_lines = io.StringIO(backup_content).readlines()
             
             diff = list(difflib.unified_diff(
                 backup_lines,
                 current_lines,
-                fromfile=f"{path.name} (backup)",
-                tofile=f"{path.name} (current)",
-                lineterm=""
+                fromfile=fromfile,
+                tofile=tofile,
+                n=context_lines
             ))
             
             if not diff:
                 return "No differences found"
             
-            return f"Differences for '{path}':\n\n" + "\n".join(diff)
+            return f"Differences for '{path}':\n\n" + "".join(diff).rstrip("\n")
             
         except Exception as e:
             return f"Error generating diff: {str(e)}"
@@ -271,7 +367,7 @@ class GetEditHistoryTool(FileOperationBase):
                 result = f"Edit History (last {len(entries)} entries):\n\n"
             
             for entry in entries:
-                timestamp = entry['timestamp']
+                timestamp = format_timestamp(entry['timestamp'])
                 action = entry['action']
                 file_path = entry['file']
                 details = entry['details']
@@ -301,41 +397,6 @@ class GetEditHistoryTool(FileOperationBase):
 def register_file_editing_tools(mcp: FastMCP):
     """Register file editing tools with the MCP server"""
     
-    edit_tool = EditFileLinesTool()
-    insert_tool = InsertLinesTool()
-    delete_tool = DeleteLinesTool()
-    replace_tool = ReplaceInFileTool()
-    diff_tool = GetFileDiffTool()
-    history_tool = GetEditHistoryTool()
-    
-    @mcp.tool()
-    def edit_file_lines(file_path: str, start_line: int, new_content: str, end_line: Optional[int] = None) -> str:
-        """Replace specific lines in a file with new content"""
-        return edit_tool.execute(file_path=file_path, start_line=start_line, 
-                               new_content=new_content, end_line=end_line)
-    
-    @mcp.tool()
-    def insert_lines(file_path: str, line_number: int, content: str) -> str:
-        """Insert new lines at a specific position in the file"""
-        return insert_tool.execute(file_path=file_path, line_number=line_number, content=content)
-    
-    @mcp.tool()
-    def delete_lines(file_path: str, start_line: int, end_line: Optional[int] = None) -> str:
-        """Delete specific lines from a file"""
-        return delete_tool.execute(file_path=file_path, start_line=start_line, end_line=end_line)
-    
-    @mcp.tool()
-    def replace_in_file(file_path: str, search_pattern: str, replace_with: str, use_regex: bool = False) -> str:
-        """Find and replace text in a file"""
-        return replace_tool.execute(file_path=file_path, search_pattern=search_pattern,
-                                  replace_with=replace_with, use_regex=use_regex)
-    
-    @mcp.tool()
-    def get_file_diff(file_path: str, backup_file: Optional[str] = None) -> str:
-        """Show differences between current file and its backup"""
-        return diff_tool.execute(file_path=file_path, backup_file=backup_file)
-    
-    @mcp.tool()
-    def get_edit_history(limit: int = 20, file_path: Optional[str] = None) -> str:
-        """Get the history of file edits"""
-        return history_tool.execute(limit=limit, file_path=file_path)
+    for tool in (EditFileLinesTool(), InsertLinesTool(), DeleteLinesTool(),
+                 ReplaceInFileTool(), GetFileDiffTool(), GetEditHistoryTool()):
+        register_tool(mcp, tool)
@@ -2,16 +2,49 @@
 Basic file operation tools
 """
 
-from typing import Optional
+import builtins
+import functools
+import io
+import math
+import os
+import time
+from itertools import islice
+from typing import Optional, TextIO
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core import FileOperationBase
+from ..core import MAX_FILE_SIZE, FileOperationBase, register_tool
+from ..core.utils import READ_FLAGS, decode_text, read_fd
 from ..core.exceptions import FileNotFoundError, FileAccessError
 from ..services import file_service, backup_service, history_service
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_time(seconds: int) -> str:
+    """Format a whole-second timestamp as local time"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
+
+
+def _open_lines(path: str) -> TextIO:
+    """Open a file for line iteration
+    
+    Files within MAX_FILE_SIZE are read with one os.read and served from
+    memory; larger ones are streamed so only the lines needed are read.
+    """
+    fd = os.open(path, READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        if size > MAX_FILE_SIZE:
+            stream = open(fd, 'r', encoding='utf-8')
+            fd = -1  # Now owned by the stream
+            return stream
+        return io.StringIO(decode_text(read_fd(fd, size)))
+    finally:
+        if fd >= 0:
+            os.close(fd)
+
+
 class ListFilesTool(FileOperationBase):
     """Tool for listing directory contents"""
     
@@ -25,13 +58,14 @@ class ListFilesTool(FileOperationBase):
             if not items:
                 return f"Directory '{directory}' is empty"
             
-            result = f"Contents of '{directory}':\n"
+            parts = [f"Contents of '{directory}':\n"]
             for item in items:
                 icon = "📁" if item["is_dir"] else "📄"
-                size_info = f" ({item.get('size_formatted', '')})" if item.get('size_formatted') else ""
-                result += f"{icon} {item['name']}{size_info}\n"
+                size_formatted = item.get('size_formatted')
+                parts.append(f"{icon} {item['name']} ({size_formatted})\n" if size_formatted
+                             else f"{icon} {item['name']}\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             return f"Error: {str(e)}"
@@ -59,17 +93,24 @@ class WriteFileTool(FileOperationBase):
     def __init__(self):
         super().__init__("write_file", "Write content to a file")
     
-    def execute(self, file_path: str, content: str) -> str:
+    def execute(self, file_path: str, content: str, skip_if_unchanged: bool = True) -> str:
         try:
             path = self.validate_file_path(file_path)
             
             # Create backup if file exists
             backup_path = ""
-            if path.exists():
+            try:
+                path.stat()
+            except builtins.FileNotFoundError:
+                pass
+            else:
+                # Rewriting identical content needs neither a backup nor a write
+                if skip_if_unchanged and file_service.has_content(path, content):
+                    return f"No changes: '{path}' already has this content"
                 backup_path = backup_service.create_backup(str(path))
             
-            # Write the file
-            file_service.write_file(file_path, content)
+            # Write the already-resolved path
+            file_service.write_file(path, content)
             
             # Log the edit
             history_service.log_edit("write_file", str(path), {
@@ -92,26 +133,36 @@ class GetFileLinesTool(FileOperationBase):
     def execute(self, file_path: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
         try:
             path = self.validate_file_path(file_path)
-            if not path.exists():
-                return f"File '{file_path}' does not exist"
             
-            content = file_service.read_file(file_path)
-            lines = content.splitlines()
+            # islice rejects negative bounds; report a bad range like any other error
+            if start_line < 1 or (end_line and end_line < start_line):
+                return (f"Error reading file lines: invalid line range {start_line}-{end_line} "
+                        f"(lines are 1-indexed and start_line must not exceed end_line)")
             
-            total_lines = len(lines)
-            start_idx = max(0, start_line - 1)
-            end_idx = min(total_lines, end_line) if end_line else total_lines
+            start_idx = start_line - 1
+            end_idx = end_line if end_line else None
             
-            if start_idx >= total_lines:
-                return f"Start line {start_line} exceeds file length ({total_lines} lines)"
+            # A missing file surfaces from the open itself
+            try:
+                lines_source = _open_lines(str(path))
+            except builtins.FileNotFoundError:
+                return f"File '{file_path}' does not exist"
             
-            selected_lines = lines[start_idx:end_idx]
-            result = f"Lines {start_line}-{start_idx + len(selected_lines)} of '{path}':\n\n"
+            with lines_source as f:
+                selected_lines = [line.rstrip('\n') for line in islice(f, start_idx, end_idx)]
+                if not selected_lines:
+                    # Nothing selected: count the lines for the error message
+                    f.seek(0)
+                    total_lines = sum(1 for _ in f)
+                    if start_idx >= total_lines:
+                        return f"Start line {start_line} exceeds file length ({total_lines} lines)"
+            
+            parts = [f"Lines {start_line}-{start_idx + len(selected_lines)} of '{path}':\n\n"]
             
             for i, line in enumerate(selected_lines, start=start_line):
-                result += f"{i:4d}: {line}\n"
+                parts.append(f"{i:4d}: {line}\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             return f"Error reading file lines: {str(e)}"
@@ -127,22 +178,23 @@ class GetFileInfoTool(FileOperationBase):
         try:
             info = file_service.get_file_info(file_path)
             
-            result = f"Information for '{info['path']}':\n"
-            result += f"  Name: {info['name']}\n"
-            result += f"  Size: {info['size_formatted']} ({info['size']} bytes)\n"
-            result += f"  Type: {'File' if info['is_file'] else 'Directory' if info['is_dir'] else 'Other'}\n"
-            result += f"  Extension: {info['extension'] or 'None'}\n"
-            result += f"  Permissions: {info['permissions']}\n"
-            result += f"  Parent: {info['parent']}\n"
+            parts = [
+                f"Information for '{info['path']}':\n",
+                f"  Name: {info['name']}\n",
+                f"  Size: {info['size_formatted']} ({info['size']} bytes)\n",
+                f"  Type: {'File' if info['is_file'] else 'Directory' if info['is_dir'] else 'Other'}\n",
+                f"  Extension: {info['extension'] or 'None'}\n",
+                f"  Permissions: {info['permissions']}\n",
+                f"  Parent: {info['parent']}\n",
+            ]
             
-            import datetime
-            result += f"  Modified: {datetime.datetime.fromtimestamp(info['modified_time']).strftime('%Y-%m-%d %H:%M:%S')}\n"
-            result += f"  Created: {datetime.datetime.fromtimestamp(info['created_time']).strftime('%Y-%m-%d %H:%M:%S')}\n"
+            parts.append(f"  Modified: {_format_time(math.floor(info['modified_time']))}\n")
+            parts.append(f"  Created: {_format_time(math.floor(info['created_time']))}\n")
             
             if info['is_symlink']:
-                result += "  Type: Symbolic Link\n"
+                parts.append("  Type: Symbolic Link\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             return f"Error getting file info: {str(e)}"
@@ -151,34 +203,6 @@ class GetFileInfoTool(FileOperationBase):
 def register_file_operations(mcp: FastMCP):
     """Register file operation tools with the MCP server"""
     
-    list_tool = ListFilesTool()
-    read_tool = ReadFileTool()
-    write_tool = WriteFileTool()
-    lines_tool = GetFileLinesTool()
-    info_tool = GetFileInfoTool()
-    
-    @mcp.tool()
-    def list_files(directory: str = ".", show_hidden: bool = False) -> str:
-        """List files and directories in the specified path"""
-        return list_tool.execute(directory=directory, show_hidden=show_hidden)
-    
-    @mcp.tool()
-    def read_file(file_path: str) -> str:
-        """Read the contents of a text file"""
-        return read_tool.execute(file_path=file_path)
-    
-    @mcp.tool()
-    def write_file(file_path: str, content: str) -> str:
-        """Write content to a file"""
-        return write_tool.execute(file_path=file_path, content=content)
-    
-    @mcp.tool()
-    def get_file_lines(file_path: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
-        """Get specific lines from a file (1-indexed)"""
-        return lines_tool.execute(file_path=file_path, start_line=start_line, end_line=end_line)
-    
-    @mcp.tool()
-    def get_file_info(file_path: str) -> str:
-        """Get detailed information about a file or directory"""
-        return info_tool.execute(file_path=file_path)
-
+    for tool in (ListFilesTool(), ReadFileTool(), WriteFileTool(),
+                 GetFileLinesTool(), GetFileInfoTool()):
+        register_tool(mcp, tool)
@@ -2,22 +2,161 @@
 Advanced search tools for MCP.
 """
 
+import mmap
 import os
 import re
-import fnmatch
+import threading
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional, List
+from typing import AnyStr, Callable, Deque, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
 
 from mcp.server.fastmcp import FastMCP
 
 # Assuming these imports are available in your project structure
+from ..core import threadpool
 from ..core.constants import DEFAULT_EXCLUDE_PATTERNS, FILE_TYPE_GROUPS
-from ..core.utils import should_exclude_file, is_text_file
+from ..core.utils import (
+    READ_FLAGS, compile_includes, decode_text, is_text_by_ext, is_text_file, read_fd, walk_filtered
+)
 from ..models.file_models import SearchMatch
 
 
 # --- Implementation of the search logic ---
 
+def _is_searchable(file_path: str) -> bool:
+    """Check if a file is text, going by its extension before touching the file"""
+    known = is_text_by_ext(os.path.splitext(file_path)[1].lower())
+    return is_text_file(file_path) if known is None else known
+
+
+def _count_newlines(buf: Union[str, bytes, mmap.mmap], start: int, end: int) -> int:
+    """Count newlines in buf[start:end] with the buffer's own C-level count"""
+    if isinstance(buf, str):
+        return buf.count('\n', start, end)
+    if isinstance(buf, mmap.mmap):
+        # mmap has no count(); the slice copies only the span being counted
+        return buf[start:end].count(b'\n')
+    return buf.count(b'\n', start, end)
+
+
+def _read_search_file(file_path: str) -> bytes:
+    """Read a file with one open, fstat and read, skipping the buffered I/O stack"""
+    fd = os.open(file_path, READ_FLAGS)
+    try:
+        return read_fd(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+
+def _read_cached(file_path: str) -> Optional[bytearray]:
+    """Read a file only if it is entirely in the page cache
+    
+    Uses preadv with RWF_NOWAIT, which fails instead of waiting on the disk.
+    Returns None when any part of the file would need I/O.
+    """
+    fd = os.open(file_path, READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        buf = bytearray(size + 1)
+        try:
+            n = os.preadv(fd, [buf], 0, os.RWF_NOWAIT)
+        except OSError:
+            return None  # EAGAIN, or a filesystem without NOWAIT support
+        if n != size:
+            return None  # Partly cached, or the file changed size
+        del buf[n:]
+        return buf
+    finally:
+        os.close(fd)
+
+
+def _search_content(data: Union[bytes, bytearray], binary: bool) -> Union[str, bytes, bytearray]:
+    """File contents in the form the search runs on: raw bytes, or decoded text"""
+    return data if binary else decode_text(data, 'ignore')
+
+
+def _matching_lines(buf: Union[str, bytes, mmap.mmap], find: Callable[[int], int],
+                    newline: Union[str, bytes]) -> Iterator[Tuple[int, Union[str, bytes]]]:
+    """Yield (line number, line) once for each line of buf holding a match
+    
+    find(pos) returns the offset of the next match at or after pos, or -1.
+    Line numbers are kept by counting newlines between consecutive matches,
+    so text after the last match is never scanned for line breaks.
+    """
+    line_number = 1
+    counted = 0
+    pos = find(0)
+    while pos >= 0:
+        start = buf.rfind(newline, 0, pos) + 1
+        line_number += _count_newlines(buf, counted, start)
+        counted = start
+        end = buf.find(newline, pos)
+        if end < 0:
+            end = len(buf)
+        yield line_number, buf[start:end]
+        if end >= len(buf):
+            break
+        # Continue on the next line so each line is reported once
+        pos = find(end + 1)
+
+
+# search_in_files reads files below this size instead of memory-mapping them
+_MMAP_MIN_SIZE = 256 * 1024
+
+
+def _grep_file(file_path: str, needle: Optional[bytes],
+               pattern: Optional[Pattern]) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, stripped line) for lines of a file matching needle or pattern
+    
+    Small files are read into bytes with a single read; larger ones are
+    memory-mapped, so literal searches run bytes.find over the page cache
+    without copying the file into a Python object.
+    """
+    fd = os.open(file_path, READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        data: Union[bytes, mmap.mmap]
+        if size < _MMAP_MIN_SIZE:
+            # Cheaper than mapping, and bytes counts newlines without slicing
+            data = read_fd(fd, size)
+        else:
+            try:
+                data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                data = read_fd(fd, size)  # Unmappable file
+    finally:
+        os.close(fd)
+    try:
+        if needle is not None:
+            for line_number, line in _matching_lines(data, lambda pos: data.find(needle, pos), b'\n'):
+                yield line_number, line.decode('utf-8', 'ignore').strip()
+        else:
+            text = decode_text(data, 'ignore')
+            
+            def find(pos: int) -> int:
+                while True:
+                    match = pattern.search(text, pos)
+                    if match is None:
+                        return -1
+                    start = text.rfind('\n', 0, match.start()) + 1
+                    end = text.find('\n', match.start())
+                    if end < 0:
+                        end = len(text)
+                    # A hit can run past the line break; only lines that match on their own count
+                    if pattern.search(text[start:end]):
+                        return start
+                    if end >= len(text):
+                        return -1
+                    pos = end + 1
+            
+            for line_number, line in _matching_lines(text, find, '\n'):
+                yield line_number, line.strip()
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
 def _search_in_files_impl(search_pattern: str, directory: str = ".", file_pattern: str = "*", use_regex: bool = False) -> str:
     """Implementation for searching text patterns across multiple files"""
     try:
@@ -25,27 +164,26 @@ def _search_in_files_impl(search_pattern: str, directory: str = ".", file_patter
         if not path.exists():
             return f"Directory '{directory}' does not exist"
         
+        # Literal terms are searched as UTF-8 bytes; regexes run over the decoded text
+        pattern = re.compile(search_pattern, re.MULTILINE) if use_regex else None
+        needle = None if use_regex else search_pattern.encode('utf-8')
+        
         matches = []
+        # Patterns with a directory part match against the relative path, like rglob
+        match_path = '/' in file_pattern
+        if match_path:
+            file_pattern = '*/' + file_pattern
+        file_re = compile_includes((file_pattern,))
+        prefix_len = len(os.path.join(str(path), ''))
         
-        for file_path in path.rglob(file_pattern):
-            if file_path.is_file() and is_text_file(file_path):
+        for entry in walk_filtered(path):
+            target = '/' + entry.path[prefix_len:].replace(os.sep, '/') if match_path else entry.name
+            if not file_re.match(target):
+                continue
+            if entry.is_file() and _is_searchable(entry.path):
                 try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    if use_regex:
-                        # Find all lines that contain a match, not just the matches themselves
-                        if re.search(search_pattern, content, re.MULTILINE):
-                            lines = content.split('\n')
-                            for i, line in enumerate(lines, 1):
-                                if re.search(search_pattern, line):
-                                    matches.append(f"{file_path}:{i}: {line.strip()}")
-                    else:
-                        if search_pattern in content:
-                            lines = content.split('\n')
-                            for i, line in enumerate(lines, 1):
-                                if search_pattern in line:
-                                    matches.append(f"{file_path}:{i}: {line.strip()}")
+                    matches.extend(f"{entry.path}:{i}: {line}"
+                                   for i, line in _grep_file(entry.path, needle, pattern))
                 except Exception:
                     # Ignore files that can't be read
                     continue
@@ -67,6 +205,141 @@ def _search_in_files_impl(search_pattern: str, directory: str = ".", file_patter
         return f"Error searching files: {str(e)}"
 
 
+# Scans allowed in flight before the walker waits for the oldest one
+_SEARCH_WINDOW = threadpool.MAX_WORKERS * 4
+
+# Linux can read page-cached files without blocking, so the walker scans
+# those itself and only hands files that need disk I/O to the pool
+_HAS_NOWAIT = hasattr(os, 'RWF_NOWAIT') and hasattr(os, 'preadv')
+
+
+def _iter_search_files(base_path: Path, include_re: Pattern, exclude_list: Sequence[str],
+                       show_hidden: bool) -> Iterator[Tuple[str, str]]:
+    """Walk base_path, yielding (path, relative path) for files that pass the filters
+    
+    Entries come from os.scandir, so file types are known without a stat per entry.
+    """
+    prefix_len = len(os.path.join(str(base_path), ''))
+    for entry in walk_filtered(base_path, exclude_list, include_hidden=show_hidden):
+        if not include_re.match(entry.name):
+            continue
+        # Symlinks are the only entries that need a stat here
+        if entry.is_file():
+            yield entry.path, entry.path[prefix_len:]
+
+
+def _scan_file(file_path: str, rel_path: str, pattern: Pattern, needle: Optional[AnyStr],
+               fold_case: bool, context_lines: int, max_results: int,
+               stop: threading.Event) -> Optional[List[SearchMatch]]:
+    """Read and search one file, returning its matches or None if it was not searched"""
+    if stop.is_set() or not _is_searchable(file_path):
+        return None
+    try:
+        data = _read_search_file(file_path)
+    except Exception:
+        return []
+    return _scan_text(_search_content(data, isinstance(pattern.pattern, bytes)), rel_path,
+                      pattern, needle, fold_case, context_lines, max_results)
+
+
+def _as_text(line: str) -> str:
+    return line
+
+
+def _decode_line(line: Union[bytes, bytearray]) -> str:
+    """Decode one line of a file searched as raw bytes"""
+    return line.decode('utf-8', 'ignore')
+
+
+def _scan_text(content: Union[str, bytes, bytearray], rel_path: str, pattern: Pattern,
+               needle: Optional[AnyStr], fold_case: bool, context_lines: int,
+               max_results: int) -> List[SearchMatch]:
+    """Search the contents of one file
+    
+    The pattern runs over the whole file to find the next line with a hit,
+    then over that line on its own, so no match spans a line break. Line
+    numbers are kept by counting newlines between matching lines, and
+    context lines are found with find/rfind around each one.
+    A literal needle, when given, rejects files without a substring test
+    (casefolded for case-insensitive searches).
+    
+    Content may be raw bytes with a bytes pattern; then only the lines that
+    are reported get decoded, and columns are counted in characters.
+    """
+    matches: List[SearchMatch] = []
+    if needle is not None and needle not in (content.casefold() if fold_case else content):
+        return matches
+    
+    if isinstance(content, str):
+        newline, text = '\n', _as_text
+    else:
+        newline, text = b'\n', _decode_line
+    size = len(content)
+    line_number = 1
+    counted = 0
+    
+    pos = 0
+    while pos <= size:
+        hit = pattern.search(content, pos)
+        if hit is None:
+            break
+        match_start = hit.start()
+        if match_start == size and (not size or content.endswith(newline)):
+            break  # Empty match past the last line
+        
+        line_start = content.rfind(newline, 0, match_start) + 1
+        line_end = content.find(newline, match_start)
+        if line_end < 0:
+            line_end = size
+        pos = line_end + 1
+        line = content[line_start:line_end]
+        # The hit can run past the line break; matches come from the line on its own
+        line_matches = list(pattern.finditer(line))
+        if not line_matches:
+            continue
+        
+        line_number += content.count(newline, counted, line_start)
+        counted = line_start
+        line_content = text(line).strip()
+        
+        # Walk out from the matching line for the surrounding context
+        before = []
+        pos_before = line_start
+        while pos_before and len(before) < context_lines:
+            prev = content.rfind(newline, 0, pos_before - 1) + 1
+            before.append(content[prev:pos_before - 1])
+            pos_before = prev
+        after = []
+        pos_after = line_end + 1
+        while pos_after < size and len(after) < context_lines:
+            nxt = content.find(newline, pos_after)
+            if nxt < 0:
+                nxt = size
+            after.append(content[pos_after:nxt])
+            pos_after = nxt + 1
+        
+        first = line_number - len(before)
+        # Shared by every match on this line
+        context = [f"{'   ' if i != line_number else '>> '}{i:4d}: {text(part).rstrip()}"
+                   for i, part in enumerate(before[::-1] + [line] + after, first)]
+        
+        for match_obj in line_matches:
+            start, end = match_obj.span()
+            head = text(line[:start])
+            
+            matches.append(SearchMatch(
+                file_path=rel_path,
+                line_number=line_number,
+                column=len(head) + 1,
+                line_content=line_content,
+                highlighted_line=f"{head}**{text(line[start:end])}**{text(line[end:])}".strip(),
+                context_lines=context
+            ))
+            if len(matches) >= max_results:
+                return matches
+    return matches
+
+
 def _search_adv_impl(
     search_term: str,
     search_path: str = ".",
@@ -86,8 +359,8 @@ def _search_adv_impl(
         if not base_path.exists():
             return f"❌ Path '{search_path}' does not exist"
         
-        # Prepare search pattern
-        search_flags = 0 if case_sensitive else re.IGNORECASE
+        # Prepare search pattern; it runs over whole files, so ^ and $ must match per line
+        search_flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
         
         if use_regex:
             try:
@@ -95,10 +368,24 @@ def _search_adv_impl(
                 pattern = re.compile(pattern_str, search_flags)
             except re.error as e:
                 return f"❌ Invalid regex pattern: {e}"
+        elif case_sensitive and not whole_word and not any(c in search_term for c in '\r\n'):
+            # A plain literal matches the same spans in UTF-8 bytes as in the
+            # decoded text, so files are searched without decoding them
+            pattern = re.compile(re.escape(search_term).encode('utf-8'))
         else:
             escaped_term = re.escape(search_term)
             pattern_str = r'\b' + escaped_term + r'\b' if whole_word else escaped_term
             pattern = re.compile(pattern_str, search_flags)
+        binary = isinstance(pattern.pattern, bytes)
+        
+        # Literal terms prefilter files with a substring test. Case-insensitive
+        # prefiltering is limited to ASCII terms, where casefold() on both sides
+        # keeps every file the IGNORECASE pattern could match.
+        needle = None
+        if binary:
+            needle = search_term.encode('utf-8') if search_term else None
+        elif not use_regex and search_term and (case_sensitive or search_term.isascii()):
+            needle = search_term if case_sensitive else search_term.casefold()
         
         # Prepare file patterns
         if include_patterns:
@@ -107,8 +394,10 @@ def _search_adv_impl(
             include_list = FILE_TYPE_GROUPS[file_types]
         else:
             include_list = [f"*.{p.strip()}" for p in file_types.split(',')] if file_types != "all" else ["*"]
+        # One regex union decides inclusion; excludes are compiled by should_exclude_file
+        include_re = compile_includes(tuple(include_list))
         
-        exclude_list = DEFAULT_EXCLUDE_PATTERNS.copy()
+        exclude_list = list(DEFAULT_EXCLUDE_PATTERNS)
         if exclude_patterns:
             exclude_list.extend([p.strip() for p in exclude_patterns.split(',')])
         
@@ -117,67 +406,60 @@ def _search_adv_impl(
         files_searched = 0
         files_with_matches = 0
         
-        # Walk through directory
-        for root, dirs, files in os.walk(base_path, topdown=True):
-            root_path = Path(root)
+        # Walk on this thread and scan files on the pool, except cached text
+        # files, which are scanned right here. Results are consumed in walk
+        # order, so output matches a serial walk.
+        stop = threading.Event()
+        pending: Deque = deque()
+        
+        def collect() -> None:
+            nonlocal files_searched, files_with_matches
+            file_matches = pending.popleft().result()
+            if file_matches is None:
+                return
+            files_searched += 1
+            if file_matches:
+                files_with_matches += 1
+                matches.extend(file_matches[:max_results - len(matches)])
+        
+        executor = threadpool.get_executor()
+        try:
+            for file_path, rel_path in _iter_search_files(base_path, include_re, exclude_list, show_hidden):
+                content = None
+                if _HAS_NOWAIT and is_text_by_ext(os.path.splitext(file_path)[1].lower()):
+                    try:
+                        content = _read_cached(file_path)
+                    except OSError:
+                        pass
+                if content is not None:
+                    future: Future = Future()
+                    future.set_result(_scan_text(_search_content(content, binary), rel_path, pattern,
+                                                 needle, not case_sensitive, context_lines, max_results))
+                else:
+                    future = executor.submit(_scan_file, file_path, rel_path, pattern, needle,
+                                             not case_sensitive, context_lines, max_results, stop)
+                pending.append(future)
+                if len(pending) >= _SEARCH_WINDOW:
+                    collect()
+                    if len(matches) >= max_results:
+                        break
             
-            # Filter directories based on exclude patterns and hidden flag
-            dirs[:] = [d for d in dirs if not should_exclude_file(root_path / d, exclude_list) and (show_hidden or not d.startswith('.'))]
-
-            for file_name in files:
-                if not show_hidden and file_name.startswith('.'):
-                    continue
-                
-                file_path = root_path / file_name
-                
-                if not any(fnmatch.fnmatch(file_name, p) for p in include_list):
-                    continue
-                
-                if should_exclude_file(file_path, exclude_list):
-                    continue
-                
-                if not is_text_file(file_path):
-                    continue
-                
-                files_searched += 1
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    file_has_match = False
-                    for line_num, line in enumerate(lines, 1):
-                        for match_obj in pattern.finditer(line):
-                            start_line = max(0, line_num - context_lines - 1)
-                            end_line = min(len(lines), line_num + context_lines)
-                            context = [f"{'   ' if i != line_num - 1 else '>> '}{i+1:4d}: {lines[i].rstrip()}" for i in range(start_line, end_line)]
-                            
-                            match = SearchMatch(
-                                file_path=str(file_path.relative_to(base_path)),
-                                line_number=line_num,
-                                column=match_obj.start() + 1,
-                                line_content=line.strip(),
-                                context_lines=context
-                            )
-                            matches.append(match)
-                            file_has_match = True
-                            if len(matches) >= max_results:
-                                break
-                    if file_has_match:
-                        files_with_matches += 1
-                except Exception:
-                    continue
-
-                if len(matches) >= max_results:
-                    break
-            if len(matches) >= max_results:
-                break
+            while pending and len(matches) < max_results:
+                collect()
+        finally:
+            # Done or failed: skip the scans that have not started yet
+            stop.set()
+            for future in pending:
+                future.cancel()
         
         # Format results
         if not matches:
             return f"🔍 No matches found for '{search_term}' in {files_searched} files"
         
-        result = f"🔍 **Search Results for '{search_term}'**\n"
-        result += f"Found {len(matches)} matches in {files_with_matches} files (searched {files_searched} files)\n\n"
+        parts = [
+            f"🔍 **Search Results for '{search_term}'**\n",
+            f"Found {len(matches)} matches in {files_with_matches} files (searched {files_searched} files)\n\n",
+        ]
         
         files_dict = {}
         for match in matches:
@@ -186,15 +468,20 @@ def _search_adv_impl(
             files_dict[match.file_path].append(match)
         
         for file_path, file_matches in files_dict.items():
-            result += f"📄 **{file_path}** ({len(file_matches)} matches)\n"
+            parts.append(f"📄 **{file_path}** ({len(file_matches)} matches)\n")
+            block = ""
+            previous = None
             for match in file_matches:
-                result += "\n".join(f"     {line}" for line in match.context_lines)
-                result += "\n---\n"
+                # Matches on the same line share one context list; render it once
+                if match.context_lines is not previous:
+                    previous = match.context_lines
+                    block = "".join(f"     {line}\n" for line in previous) + "---\n"
+                parts.append(block)
         
         if len(matches) >= max_results:
-            result += f"\n⚠️ Results limited to {max_results} matches. Consider refining your search."
+            parts.append(f"\n⚠️ Results limited to {max_results} matches. Consider refining your search.")
             
-        return result.strip()
+        return "".join(parts).strip()
         
     except Exception as e:
         return f"❌ Search error: {str(e)}"
@@ -5,15 +5,132 @@ System operation tools for MCP Local
 import subprocess
 import platform
 import os
-import json
+import heapq
+import re
+import shlex
+import shutil
+import time
 import psutil
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core import ToolBase
-from ..core.config import DANGEROUS_COMMANDS, COMMAND_TIMEOUT
+from ..core import ToolBase, register_tool, threadpool
+from ..core.config import DANGEROUS_COMMANDS_RE, COMMAND_TIMEOUT
+from ..core.utils import compile_includes
+from ..models._serialize import serialize
+
+# Substrings refused anywhere in a command, on top of DANGEROUS_COMMANDS
+_DANGEROUS_PATTERNS = (
+    '>', '>>', '|', '&', ';', '&&', '||',  # Redirection and chaining
+    'chmod', 'chown', 'mount', 'umount',   # File permissions
+    'kill', 'killall', 'pkill',            # Process killing
+    'shutdown', 'reboot', 'halt',          # System control
+    'dd', 'fdisk', 'mkfs',                 # Disk operations
+    'crontab', 'at',                       # Job scheduling
+    'wget', 'curl', 'nc', 'netcat',        # Network tools
+)
+# One scan of the command instead of a substring test per pattern
+_DANGEROUS_PATTERNS_RE = re.compile('|'.join(map(re.escape, _DANGEROUS_PATTERNS)))
+# Every match starts with one of these characters, so a command without any can skip the scan
+_DANGEROUS_TRIGGERS = frozenset(p[0] for p in _DANGEROUS_PATTERNS)
+
+# Characters whose meaning needs a shell: expansions, globs, input redirection, grouping
+_SHELL_SYNTAX_RE = re.compile(r'[$`*?\[~<(){}!#\n]')
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """Split a command into argv when it can run without a shell, else None"""
+    if _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        return None  # Unbalanced quotes; sh reports the error
+    if not args or '=' in args[0]:
+        return None  # Empty, or a leading VAR=value assignment
+    return args
+
+
+_PROCESS_TABLE_HEADER = f"{'PID':<8} {'NAME':<20} {'CPU%':<8} {'MEM%':<8}\n" + "-" * 50 + "\n"
+
+# Seconds between the two cpu_percent() samples of get_running_processes
+CPU_SAMPLE_INTERVAL = 0.1
+
+
+def _disk_usage(path: str) -> Tuple[int, int, int]:
+    """Total, used and free bytes of the filesystem holding path
+    
+    Calls os.statvfs directly where it exists, with psutil's definitions:
+    free is what unprivileged users can still use, and used excludes
+    blocks reserved for root.
+    """
+    if not hasattr(os, 'statvfs'):
+        usage = shutil.disk_usage(path)
+        return usage.total, usage.used, usage.free
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    return total, used, free
+
+
+def _match_row(entry: os.DirEntry) -> Tuple[float, int, str]:
+    """(mtime, size, path) of a find_files match, zeros if it can't be stat'ed"""
+    try:
+        stat = entry.stat()
+    except OSError:
+        return 0, 0, entry.path
+    return stat.st_mtime, stat.st_size, entry.path
+
+
+# Seconds a get_system_info result is served again instead of re-read
+SYSTEM_INFO_TTL = 5.0
+
+# find_files stops walking after this many times max_results matches
+FIND_OVERSCAN = 4
+
+# Matches above this count are stat'ed on a thread pool
+FIND_PARALLEL_STAT_MIN = 64
+
+_HAS_PROC_MEMINFO = os.path.exists('/proc/meminfo')
+
+
+def _meminfo_kb(buf: bytes, field: bytes) -> int:
+    """Value of one /proc/meminfo field in kB, or -1 if it is missing"""
+    # Anchor at a line start so b'Cached:' doesn't hit SwapCached:
+    if buf.startswith(field):
+        start = 0
+    else:
+        start = buf.find(b'\n' + field)
+        if start < 0:
+            return -1
+        start += 1
+    end = buf.find(b'\n', start)
+    return int(buf[start + len(field):end if end >= 0 else len(buf)].split()[0])
+
+
+def _linux_meminfo() -> Optional[Tuple[int, int, int]]:
+    """Total, available and used memory in bytes from a single /proc/meminfo read
+    
+    used follows psutil on Linux: total - free - cached - buffers, where
+    cached includes SReclaimable, falling back to total - free.
+    Returns None when MemAvailable is missing (kernels before 3.14).
+    """
+    with open('/proc/meminfo', 'rb') as f:
+        buf = f.read()
+    total = _meminfo_kb(buf, b'MemTotal:')
+    available = _meminfo_kb(buf, b'MemAvailable:')
+    free = _meminfo_kb(buf, b'MemFree:')
+    if total <= 0 or available < 0 or free < 0:
+        return None
+    buffers = max(_meminfo_kb(buf, b'Buffers:'), 0)
+    cached = max(_meminfo_kb(buf, b'Cached:'), 0) + max(_meminfo_kb(buf, b'SReclaimable:'), 0)
+    used = total - free - cached - buffers
+    if used < 0:
+        used = total - free
+    return total * 1024, available * 1024, used * 1024
 
 
 class RunCommandTool(ToolBase):
@@ -26,32 +143,51 @@ class RunCommandTool(ToolBase):
         """Execute a shell command with security checks"""
         try:
             # Security: Check for dangerous commands
-            if any(cmd in command.lower() for cmd in DANGEROUS_COMMANDS):
+            if DANGEROUS_COMMANDS_RE.search(command):
                 return "Error: Command not allowed for security reasons"
             
             # Additional security checks
             if self._is_command_dangerous(command):
                 return "Error: Command contains potentially dangerous operations"
             
-            # Execute the command
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=COMMAND_TIMEOUT
-            )
+            # Execute the command; plain commands skip the /bin/sh in between
+            args = _direct_argv(command)
+            # Builtins and unknown programs are left to the shell
+            executable = shutil.which(args[0]) if args is not None else None
+            result = None
+            if executable is not None:
+                try:
+                    # An absolute executable and close_fds=False let subprocess
+                    # use posix_spawn (vfork) instead of fork+exec; our own fds
+                    # are non-inheritable (PEP 446), so none leak to the child
+                    result = subprocess.run(
+                        args,
+                        executable=executable,
+                        close_fds=False,
+                        capture_output=True,
+                        text=True,
+                        timeout=COMMAND_TIMEOUT
+                    )
+                except OSError:
+                    pass  # Not runnable directly after all; let sh report it
+            if result is None:
+                result = subprocess.run(
+                    command, 
+                    shell=True, 
+                    capture_output=True, 
+                    text=True, 
+                    timeout=COMMAND_TIMEOUT
+                )
             
             # Format output
-            output = f"Command: {command}\n"
-            output += f"Exit code: {result.returncode}\n"
+            parts = [f"Command: {command}\n", f"Exit code: {result.returncode}\n"]
             
             if result.stdout:
-                output += f"Output:\n{result.stdout}\n"
+                parts.append(f"Output:\n{result.stdout}\n")
             if result.stderr:
-                output += f"Error:\n{result.stderr}\n"
+                parts.append(f"Error:\n{result.stderr}\n")
             
-            return output
+            return "".join(parts)
             
         except subprocess.TimeoutExpired:
             return f"Error: Command timed out ({COMMAND_TIMEOUT}s limit)"
@@ -60,18 +196,10 @@ class RunCommandTool(ToolBase):
     
     def _is_command_dangerous(self, command: str) -> bool:
         """Additional security checks for dangerous command patterns"""
-        dangerous_patterns = [
-            '>', '>>', '|', '&', ';', '&&', '||',  # Redirection and chaining
-            'chmod', 'chown', 'mount', 'umount',   # File permissions
-            'kill', 'killall', 'pkill',            # Process killing
-            'shutdown', 'reboot', 'halt',          # System control
-            'dd', 'fdisk', 'mkfs',                 # Disk operations
-            'crontab', 'at',                       # Job scheduling
-            'wget', 'curl', 'nc', 'netcat',       # Network tools
-        ]
-        
         command_lower = command.lower()
-        return any(pattern in command_lower for pattern in dangerous_patterns)
+        if _DANGEROUS_TRIGGERS.isdisjoint(command_lower):
+            return False
+        return _DANGEROUS_PATTERNS_RE.search(command_lower) is not None
 
 
 class GetSystemInfoTool(ToolBase):
@@ -79,70 +207,111 @@ class GetSystemInfoTool(ToolBase):
     
     def __init__(self):
         super().__init__("get_system_info", "Get comprehensive system information")
+        # Host facts that cannot change while the server runs, filled on first use
+        self._static: Optional[Dict[str, Dict[str, Any]]] = None
+        self._self_proc = psutil.Process()
+        # (time.monotonic() when rendered, JSON), reused for SYSTEM_INFO_TTL seconds
+        self._cached: Optional[Tuple[float, str]] = None
+    
+    def _static_info(self) -> Dict[str, Dict[str, Any]]:
+        """Platform details, home directories and CPU topology, read once"""
+        if self._static is None:
+            static: Dict[str, Dict[str, Any]] = {}
+            static["system"] = {
+                "os": platform.system(),
+                "os_version": platform.version(),
+                "os_release": platform.release(),
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "architecture": platform.architecture()[0],
+                "hostname": platform.node(),
+                "python_version": platform.python_version(),
+            }
+            home = str(Path.home())
+            home_tmp = os.path.join(home, "tmp")
+            static["directories"] = {
+                "home": home,
+                "temp": home_tmp if os.path.exists(home_tmp) else "/tmp",
+            }
+            # cpu_count() returns None rather than raising when unknown
+            static["cpu"] = {
+                "count": psutil.cpu_count(),
+                "count_logical": psutil.cpu_count(logical=True),
+                "count_physical": psutil.cpu_count(logical=False),
+            }
+            static["current_process"] = {
+                "pid": os.getpid(),
+                "name": self._self_proc.name(),
+            }
+            self._static = static
+        return self._static
     
     def execute(self) -> str:
         """Get detailed system information"""
         try:
-            info = self._collect_system_info()
-            return json.dumps(info, indent=2)
+            now = time.monotonic()
+            cached = self._cached
+            if cached is not None and now - cached[0] < SYSTEM_INFO_TTL:
+                return cached[1]
+            result = serialize(self._collect_system_info(), indent=True).decode('utf-8')
+            self._cached = (now, result)
+            return result
         except Exception as e:
             return f"Error getting system info: {str(e)}"
     
     def _collect_system_info(self) -> Dict[str, Any]:
         """Collect comprehensive system information"""
         info = {}
+        static = self._static_info()
         
         # Basic system info
-        info["system"] = {
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "os_release": platform.release(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
-            "architecture": platform.architecture()[0],
-            "hostname": platform.node(),
-            "python_version": platform.python_version(),
-        }
+        info["system"] = dict(static["system"])
         
         # Directory information
         info["directories"] = {
-            "current": os.getcwd(),
-            "home": str(Path.home()),
-            "temp": str(Path.home() / "tmp") if (Path.home() / "tmp").exists() else "/tmp",
+            "current": os.getcwd(),  # The only one that can change
+            **static["directories"],
         }
         
         # CPU information
         try:
+            freq = psutil.cpu_freq()
             info["cpu"] = {
-                "count": psutil.cpu_count(),
-                "count_logical": psutil.cpu_count(logical=True),
-                "count_physical": psutil.cpu_count(logical=False),
-                "usage_percent": psutil.cpu_percent(interval=1),
-                "frequency": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
+                **static["cpu"],
+                # Usage since the previous call (or since the tools were registered)
+                "usage_percent": psutil.cpu_percent(interval=None),
+                "frequency": freq._asdict() if freq else None,
             }
         except Exception:
             info["cpu"] = {"error": "Unable to get CPU information"}
         
         # Memory information
         try:
-            memory = psutil.virtual_memory()
+            meminfo = _linux_meminfo() if _HAS_PROC_MEMINFO else None
+            if meminfo is not None:
+                total, available, used = meminfo
+                # psutil's percent is also (total - available) / total
+                percent = round((total - available) / total * 100, 1)
+            else:
+                memory = psutil.virtual_memory()
+                total, available, used, percent = memory.total, memory.available, memory.used, memory.percent
             info["memory"] = {
-                "total_gb": round(memory.total / (1024**3), 2),
-                "available_gb": round(memory.available / (1024**3), 2),
-                "used_gb": round(memory.used / (1024**3), 2),
-                "usage_percent": memory.percent,
+                "total_gb": round(total / (1024**3), 2),
+                "available_gb": round(available / (1024**3), 2),
+                "used_gb": round(used / (1024**3), 2),
+                "usage_percent": percent,
             }
         except Exception:
             info["memory"] = {"error": "Unable to get memory information"}
         
         # Disk information
         try:
-            disk = psutil.disk_usage('/')
+            total, used, free = _disk_usage('/')
             info["disk"] = {
-                "total_gb": round(disk.total / (1024**3), 2),
-                "used_gb": round(disk.used / (1024**3), 2),
-                "free_gb": round(disk.free / (1024**3), 2),
-                "usage_percent": round((disk.used / disk.total) * 100, 2),
+                "total_gb": round(total / (1024**3), 2),
+                "used_gb": round(used / (1024**3), 2),
+                "free_gb": round(free / (1024**3), 2),
+                "usage_percent": round((used / total) * 100, 2),
             }
         except Exception:
             info["disk"] = {"error": "Unable to get disk information"}
@@ -162,9 +331,8 @@ class GetSystemInfoTool(ToolBase):
             info["processes"] = {
                 "count": len(psutil.pids()),
                 "current_process": {
-                    "pid": os.getpid(),
-                    "name": psutil.Process().name(),
-                    "memory_mb": round(psutil.Process().memory_info().rss / (1024**2), 2),
+                    **static["current_process"],
+                    "memory_mb": round(self._self_proc.memory_info().rss / (1024**2), 2),
                 }
             }
         except Exception:
@@ -184,10 +352,30 @@ class GetRunningProcessesTool(ToolBase):
         try:
             processes = []
             
-            # Get all processes
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            # The first cpu_percent() of a process only starts its sample, so
+            # prime every process, wait once, then read real values
+            procs = []
+            for proc in psutil.process_iter():
+                try:
+                    proc.cpu_percent(interval=None)
+                    procs.append(proc)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            time.sleep(CPU_SAMPLE_INTERVAL)
+            
+            # Plain process_iter() skips the per-field attrs bookkeeping, and
+            # oneshot() parses each /proc/<pid> file once for all the fields
+            # shown. psutil>=6.0 no longer checks every cached process for
+            # PID reuse on each call.
+            for proc in procs:
                 try:
-                    processes.append(proc.info)
+                    with proc.oneshot():
+                        processes.append({
+                            'pid': proc.pid,
+                            'name': proc.name(),
+                            'cpu_percent': proc.cpu_percent(interval=None),
+                            'memory_percent': proc.memory_percent(),
+                        })
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
@@ -198,14 +386,12 @@ class GetRunningProcessesTool(ToolBase):
             processes = processes[:limit]
             
             # Format output
-            output = f"Top {limit} processes by CPU usage:\n\n"
-            output += f"{'PID':<8} {'NAME':<20} {'CPU%':<8} {'MEM%':<8}\n"
-            output += "-" * 50 + "\n"
-            
+            parts = [f"Top {limit} processes by CPU usage:\n\n", _PROCESS_TABLE_HEADER]
             for proc in processes:
-                output += f"{proc['pid']:<8} {proc['name'][:19]:<20} {proc['cpu_percent']:<8.1f} {proc['memory_percent']:<8.1f}\n"
+                parts.append(f"{proc['pid']:<8} {proc['name'][:19]:<20} "
+                             f"{proc['cpu_percent']:<8.1f} {proc['memory_percent']:<8.1f}\n")
             
-            return output
+            return "".join(parts)
             
         except Exception as e:
             return f"Error getting process information: {str(e)}"
@@ -220,58 +406,72 @@ class FindFilesTool(ToolBase):
     def execute(self, pattern: str, directory: str = ".", max_results: int = 50) -> str:
         """Find files matching a pattern"""
         try:
-            from pathlib import Path
-            import fnmatch
-            
             search_path = Path(directory).resolve()
             if not search_path.exists():
                 return f"Error: Directory '{directory}' does not exist"
             
-            matches = []
+            # Stop a few times past max_results, so the newest-first sort
+            # still chooses among more files than it shows
+            limit = max_results * FIND_OVERSCAN
+            candidates: List[os.DirEntry] = []
+            # Translated to a regex once instead of going through fnmatch per file
+            name_re = compile_includes((pattern,))
             
-            # Walk through directory tree
-            for root, dirs, files in os.walk(search_path):
-                # Skip hidden directories
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                
-                for file in files:
-                    if fnmatch.fnmatch(file, pattern):
-                        full_path = Path(root) / file
+            # Walk the tree depth-first with os.scandir, in os.walk's order;
+            # directory entries give the file/dir split without a stat each
+            stack = [str(search_path)]
+            while stack and len(candidates) < limit:
+                subdirs = []
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
                         try:
-                            stat = full_path.stat()
-                            matches.append({
-                                'path': str(full_path),
-                                'size': stat.st_size,
-                                'modified': stat.st_mtime
-                            })
-                        except:
-                            matches.append({
-                                'path': str(full_path),
-                                'size': 0,
-                                'modified': 0
-                            })
-                
-                # Limit results during search to avoid memory issues
-                if len(matches) >= max_results:
-                    break
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            # Skip hidden directories; like os.walk, don't follow symlinks
+                            if not entry.name.startswith('.') and not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif name_re.match(entry.name):
+                            candidates.append(entry)
+                            if len(candidates) >= limit:
+                                break  # Enough matches, mid-directory included
+                stack.extend(reversed(subdirs))
             
-            # Sort by modification time (newest first)
-            matches.sort(key=lambda x: x['modified'], reverse=True)
+            # stat() releases the GIL, so many matches are stat'ed on the
+            # shared pool to overlap the waits on slow storage
+            if len(candidates) > FIND_PARALLEL_STAT_MIN:
+                rows: Iterable[Tuple[float, int, str]] = threadpool.get_executor().map(_match_row, candidates)
+            else:
+                rows = map(_match_row, candidates)
+            found = len(candidates)
+            # Min-heap holding the newest max_results matches as (mtime, size, path)
+            newest: List[Tuple[float, int, str]] = []
+            for row in rows:
+                if len(newest) < max_results:
+                    heapq.heappush(newest, row)
+                elif newest and row > newest[0]:
+                    heapq.heapreplace(newest, row)
             
             # Format output
-            if not matches:
+            if not found:
                 return f"No files found matching pattern '{pattern}' in '{directory}'"
             
-            output = f"Found {len(matches)} files matching '{pattern}' in '{directory}':\n\n"
+            parts = [f"Found {found} files matching '{pattern}' in '{directory}':\n\n"]
             
-            for match in matches[:max_results]:
-                size_str = self._format_file_size(match['size'])
-                output += f"{match['path']} ({size_str})\n"
+            # Sort by modification time (newest first)
+            for _, size, path in sorted(newest, reverse=True):
+                size_str = self._format_file_size(size)
+                parts.append(f"{path} ({size_str})\n")
             
-            if len(matches) > max_results:
-                output += f"\n... and {len(matches) - max_results} more files"
+            if found > max_results:
+                parts.append(f"\n... and {found - max_results} more files")
             
-            return output
+            return "".join(parts)
             
         except Exception as e:
             return f"Error finding files: {str(e)}"
@@ -288,31 +488,19 @@ class FindFilesTool(ToolBase):
             return f"{size_bytes/(1024**3):.1f} GB"
 
 
+# Shared by every server the tools are registered with
+run_command_tool = RunCommandTool()
+system_info_tool = GetSystemInfoTool()
+processes_tool = GetRunningProcessesTool()
+find_files_tool = FindFilesTool()
+
+
 def register_system_tools(mcp: FastMCP):
     """Register system tools with the MCP server"""
     
-    # Initialize tool instances
-    run_command_tool = RunCommandTool()
-    system_info_tool = GetSystemInfoTool()
-    processes_tool = GetRunningProcessesTool()
-    find_files_tool = FindFilesTool()
-    
-    @mcp.tool()
-    def run_command(command: str) -> str:
-        """Execute a shell command and return the output"""
-        return run_command_tool.execute(command=command)
-    
-    @mcp.tool()
-    def get_system_info() -> str:
-        """Get comprehensive system information"""
-        return system_info_tool.execute()
-    
-    @mcp.tool()
-    def get_running_processes(limit: int = 10) -> str:
-        """Get information about running processes"""
-        return processes_tool.execute(limit=limit)
+    # Start the system-wide CPU sample, so get_system_info never has to
+    # block waiting for one
+    psutil.cpu_percent(interval=None)
     
-    @mcp.tool()
-    def find_files(pattern: str, directory: str = ".", max_results: int = 50) -> str:
-        """Find files by pattern in a directory"""
-        return find_files_tool.execute(pattern=pattern, directory=directory, max_results=max_results)
\ No newline at end of file
+    for tool in (run_command_tool, system_info_tool, processes_tool, find_files_tool):
+        register_tool(mcp, tool)
@@ -19,12 +19,25 @@ def temp_dir():
     shutil.rmtree(temp_path, ignore_errors=True)
 
 
+@pytest.fixture(scope="session")
+def sample_content():
+    """Contents of the sample text file"""
+    return b"Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n"
+
+
 @pytest.fixture
-def sample_file(temp_dir):
+def sample_file(temp_dir, sample_content):
     """Create a sample text file for testing"""
     file_path = temp_dir / "sample.txt"
-    content = "Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n"
-    file_path.write_text(content)
+    file_path.write_bytes(sample_content)
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def shared_sample_file(tmp_path_factory, sample_content):
+    """Sample text file shared by the whole session; tests must not modify it"""
+    file_path = tmp_path_factory.mktemp("shared") / "sample.txt"
+    file_path.write_bytes(sample_content)
     return file_path
 
 
@@ -0,0 +1,24 @@
+"""
+Tests for the read buffer pool
+"""
+
+from mcp_local.core import bufferpool
+
+
+class TestBufferPool:
+    """Tests for rent/give_back"""
+
+    def test_rent_rounds_up_and_reuses(self):
+        """Test that returned buffers are handed out again"""
+        buf = bufferpool.rent(1000)
+        assert len(buf) == 1024
+        bufferpool.give_back(buf)
+        assert bufferpool.rent(600) is buf
+
+    def test_oversized_not_pooled(self):
+        """Test that large buffers bypass the pool"""
+        size = bufferpool.MAX_POOLED_SIZE + 1
+        buf = bufferpool.rent(size)
+        assert len(buf) == size
+        bufferpool.give_back(buf)
+        assert bufferpool.rent(size) is not buf
@@ -0,0 +1,167 @@
+"""
+Tests for file editing tools
+"""
+
+import re
+
+import pytest
+
+from mcp_local.tools import file_editing
+from mcp_local.tools.file_editing import (
+    DeleteLinesTool, EditFileLinesTool, GetFileDiffTool, InsertLinesTool, ReplaceInFileTool,
+    _compile_pattern, _regex_subn
+)
+
+
+class TestLineEditingTools:
+    """Tests for the line-based editing tools"""
+
+    def test_edit_lines(self, sample_file, reset_services):
+        """Test replacing a range of lines"""
+        result = EditFileLinesTool().execute(str(sample_file), 2, "New 2\nNew 3", end_line=3)
+
+        assert "Successfully edited" in result
+        assert sample_file.read_text() == "Line 1\nNew 2\nNew 3\nLine 4\nLine 5\n"
+
+    def test_edit_unchanged(self, sample_file, reset_services):
+        """Test that an edit with identical content is a no-op"""
+        result = EditFileLinesTool().execute(str(sample_file), 2, "Line 2")
+
+        assert "unchanged" in result
+
+    def test_insert_lines(self, sample_file, reset_services):
+        """Test inserting before a line"""
+        result = InsertLinesTool().execute(str(sample_file), 1, "Header")
+
+        assert "inserted 1 lines" in result
+        assert sample_file.read_text().startswith("Header\nLine 1\n")
+
+    def test_delete_lines(self, sample_file, reset_services):
+        """Test deleting a range of lines"""
+        result = DeleteLinesTool().execute(str(sample_file), 4, end_line=5)
+
+        assert "Successfully deleted" in result
+        assert sample_file.read_text() == "Line 1\nLine 2\nLine 3\n"
+
+    def test_invalid_line(self, sample_file, reset_services):
+        """Test that out-of-range lines are rejected"""
+        result = DeleteLinesTool().execute(str(sample_file), 9)
+
+        assert "Invalid line number 9. File has 5 lines" in result
+
+
+class TestGetFileDiffTool:
+    """Tests for GetFileDiffTool"""
+
+    @pytest.mark.parametrize("use_system_diff", [True, False])
+    def test_diff_against_backup(self, sample_file, temp_dir, monkeypatch, use_system_diff):
+        """Test diffing with the system diff and with the difflib fallback"""
+        from mcp_local.tools import file_editing
+
+        if not use_system_diff:
+            monkeypatch.setattr(file_editing, "_run_diff", lambda *args: None)
+        backup = temp_dir / "sample.txt.backup"
+        backup.write_text(sample_file.read_text())
+        sample_file.write_text(sample_file.read_text().replace("Line 3", "Changed"))
+
+        result = GetFileDiffTool().execute(str(sample_file), backup_file=str(backup))
+
+        assert "--- sample.txt (backup)\n+++ sample.txt (current)\n" in result
+        assert "\n-Line 3\n+Changed\n" in result
+
+    @pytest.mark.parametrize("use_system_diff", [True, False])
+    def test_context_lines(self, sample_file, temp_dir, monkeypatch, use_system_diff):
+        """Test that context_lines controls the hunk context"""
+        from mcp_local.tools import file_editing
+
+        if not use_system_diff:
+            monkeypatch.setattr(file_editing, "_run_diff", lambda *args: None)
+        backup = temp_dir / "sample.txt.backup"
+        backup.write_text(sample_file.read_text())
+        sample_file.write_text(sample_file.read_text().replace("Line 3", "Changed"))
+
+        result = GetFileDiffTool().execute(str(sample_file), str(backup), context_lines=0)
+
+        assert "Line 2" not in result
+        assert "@@ -3 +3 @@" in result
+
+    def test_no_differences(self, sample_file, temp_dir):
+        """Test identical files"""
+        backup = temp_dir / "sample.txt.backup"
+        backup.write_text(sample_file.read_text())
+
+        assert GetFileDiffTool().execute(str(sample_file), str(backup)) == "No differences found"
+
+
+class TestReplaceInFileTool:
+    """Tests for ReplaceInFileTool"""
+
+    def test_literal_replace(self, temp_dir, reset_services):
+        """Test literal replacement and count"""
+        path = temp_dir / "a.txt"
+        path.write_text("foo bar foo\n")
+
+        result = ReplaceInFileTool().execute(str(path), "foo", "baz")
+
+        assert "2 replacements" in result
+        assert path.read_text() == "baz bar baz\n"
+
+    def test_regex_replace(self, temp_dir, reset_services):
+        """Test regex replacement with group references"""
+        path = temp_dir / "a.txt"
+        path.write_text("x=1\ny=22\n")
+
+        result = ReplaceInFileTool().execute(str(path), r"(\w)=(\d+)", r"\2=\1", use_regex=True)
+
+        assert "2 replacements" in result
+        assert path.read_text() == "1=x\n22=y\n"
+
+    def test_invalid_regex(self, temp_dir, reset_services):
+        """Test that a bad pattern is reported"""
+        path = temp_dir / "a.txt"
+        path.write_text("text\n")
+
+        result = ReplaceInFileTool().execute(str(path), "(", "x", use_regex=True)
+
+        assert "Invalid regex pattern" in result
+        assert path.read_text() == "text\n"
+
+    def test_no_match_skips_backup(self, temp_dir, reset_services, monkeypatch):
+        """Test that a replace with no matches neither writes nor backs up"""
+        from mcp_local.services import backup_service
+
+        path = temp_dir / "a.txt"
+        path.write_text("text\n")
+        calls = []
+        monkeypatch.setattr(backup_service, "create_backup_from_bytes",
+                            lambda *args: calls.append(args))
+
+        result = ReplaceInFileTool().execute(str(path), "missing", "x")
+
+        assert "No replacements made" in result
+        assert calls == []
+
+    @pytest.mark.parametrize("pattern, repl", [
+        (r"\w+", "X"),
+        (r"\d", "#"),
+        (r"\bwörld\b", "Welt"),
+        (r"foo$", "F"),
+        (r"[[:alpha:]]+", "A"),
+        (r"ö+", "Ö"),
+        (r"(é)(l+)", r"\2\1"),
+        (r"[ä-ü]", r"[\g<0>]"),
+        (r"x*", "-"),
+    ])
+    @pytest.mark.filterwarnings("ignore:Possible nested set:FutureWarning")
+    def test_regex_matches_re_on_non_ascii(self, pattern, repl):
+        """Test that replacements are the same as with re, whether or not RE2 is installed"""
+        text = "héllo wörld 12 ３４\nfoo\n"
+        assert _regex_subn(pattern, repl, text) == re.compile(pattern).subn(repl, text)
+
+    @pytest.mark.skipif(file_editing.re2 is None, reason="google-re2 not installed")
+    def test_re2_only_for_matching_patterns(self):
+        """Test that RE2 is used only where it matches like re"""
+        _compile_pattern.cache_clear()
+        assert not isinstance(_compile_pattern("ö+"), re.Pattern)
+        assert isinstance(_compile_pattern(r"\w+"), re.Pattern)
+        assert isinstance(_compile_pattern("(?<=a)b"), re.Pattern)
@@ -8,6 +8,7 @@ from pathlib import Path
 from mcp_local.tools.file_operations import (
     ListFilesTool, ReadFileTool, WriteFileTool, GetFileLinesTool, GetFileInfoTool
 )
+from mcp_local.services import history_service
 
 
 class TestListFilesTool:
@@ -51,15 +52,15 @@ class TestListFilesTool:
 class TestReadFileTool:
     """Tests for ReadFileTool"""
     
-    def test_read_file_basic(self, sample_file):
+    def test_read_file_basic(self, shared_sample_file):
         """Test basic file reading"""
         tool = ReadFileTool()
-        result = tool.execute(file_path=str(sample_file))
+        result = tool.execute(file_path=str(shared_sample_file))
         
         assert "Line 1" in result
         assert "Line 2" in result
         assert "Line 5" in result
-        assert str(sample_file) in result
+        assert str(shared_sample_file) in result
     
     def test_read_nonexistent_file(self, temp_dir):
         """Test reading non-existent file"""
@@ -93,15 +94,28 @@ class TestWriteFileTool:
         
         assert "Successfully wrote" in result
         assert sample_file.read_text() == new_content
+        assert history_service.get_history()[-1]["details"]["backup"]
+    
+    def test_write_file_unchanged(self, sample_file, reset_services):
+        """Test that rewriting identical content is skipped unless asked for"""
+        tool = WriteFileTool()
+        content = sample_file.read_text()
+        
+        assert "No changes" in tool.execute(file_path=str(sample_file), content=content)
+        assert history_service.get_history() == []
+        
+        result = tool.execute(file_path=str(sample_file), content=content, skip_if_unchanged=False)
+        assert "Successfully wrote" in result
+        assert len(history_service.get_history()) == 1
 
 
 class TestGetFileLinesTool:
     """Tests for GetFileLinesTool"""
     
-    def test_get_lines_basic(self, sample_file):
+    def test_get_lines_basic(self, shared_sample_file):
         """Test getting specific lines"""
         tool = GetFileLinesTool()
-        result = tool.execute(file_path=str(sample_file), start_line=2, end_line=4)
+        result = tool.execute(file_path=str(shared_sample_file), start_line=2, end_line=4)
         
         assert "Line 2" in result
         assert "Line 3" in result
@@ -109,35 +123,50 @@ class TestGetFileLinesTool:
         assert "Line 1" not in result
         assert "Line 5" not in result
     
-    def test_get_lines_single(self, sample_file):
+    def test_get_lines_single(self, shared_sample_file):
         """Test getting single line"""
         tool = GetFileLinesTool()
-        result = tool.execute(file_path=str(sample_file), start_line=3)
+        result = tool.execute(file_path=str(shared_sample_file), start_line=3)
         
         assert "Line 3" in result
         assert "   3:" in result  # Line number formatting
     
-    def test_get_lines_invalid_range(self, sample_file):
+    def test_get_lines_invalid_range(self, shared_sample_file):
         """Test invalid line range"""
         tool = GetFileLinesTool()
-        result = tool.execute(file_path=str(sample_file), start_line=100)
+        result = tool.execute(file_path=str(shared_sample_file), start_line=100)
         
         assert "exceeds file length" in result
+    
+    @pytest.mark.parametrize("start_line, end_line", [(0, 2), (-1, None), (1, -1), (4, 2)])
+    def test_get_lines_bad_range(self, shared_sample_file, start_line, end_line):
+        """Test that out-of-range line numbers are reported as a tool error"""
+        tool = GetFileLinesTool()
+        result = tool.execute(file_path=str(shared_sample_file), start_line=start_line, end_line=end_line)
+        
+        assert result.startswith("Error reading file lines: invalid line range")
+    
+    def test_get_lines_nonexistent_file(self, temp_dir):
+        """Test reading lines from a missing file"""
+        tool = GetFileLinesTool()
+        result = tool.execute(file_path=str(temp_dir / "missing.txt"))
+        
+        assert "does not exist" in result
 
 
 class TestGetFileInfoTool:
     """Tests for GetFileInfoTool"""
     
-    def test_get_file_info_basic(self, sample_file):
+    def test_get_file_info_basic(self, shared_sample_file):
         """Test getting file information"""
         tool = GetFileInfoTool()
-        result = tool.execute(file_path=str(sample_file))
+        result = tool.execute(file_path=str(shared_sample_file))
         
         assert "Name:" in result
         assert "Size:" in result
         assert "Type:" in result
         assert "Modified:" in result
-        assert sample_file.name in result
+        assert shared_sample_file.name in result
     
     def test_get_file_info_directory(self, temp_dir):
         """Test getting directory information"""
@@ -0,0 +1,146 @@
+"""
+Tests for the file service
+"""
+
+import os
+import sys
+
+import pytest
+
+from mcp_local.core.exceptions import FileAccessError, FileNotFoundError, FileSizeError
+from mcp_local.services import file_service
+
+
+class TestReadFile:
+    """Tests for FileService.read_file"""
+
+    def test_normalizes_newlines(self, temp_dir):
+        """Test that CRLF and CR line endings are read as LF"""
+        path = temp_dir / "crlf.txt"
+        path.write_bytes(b"one\r\ntwo\rthree\n")
+        assert file_service.read_file(str(path)) == "one\ntwo\nthree\n"
+
+    def test_large_file(self, temp_dir):
+        """Test that files read through a memory map match their content"""
+        path = temp_dir / "large.txt"
+        content = "línea de texto\n" * 10000
+        path.write_text(content, encoding="utf-8")
+        assert file_service.read_file(str(path)) == content
+
+    def test_sees_rewrites_and_replacements(self, temp_dir):
+        """Test that repeated reads see in-place writes and replaced files"""
+        path = temp_dir / "a.txt"
+        path.write_text("first")
+        assert file_service.read_file(str(path)) == "first"
+
+        file_service.write_file(str(path), "second, longer")
+        assert file_service.read_file(str(path)) == "second, longer"
+
+        replacement = temp_dir / "b.txt"
+        replacement.write_text("third")
+        os.replace(replacement, path)
+        assert file_service.read_file(str(path)) == "third"
+        assert file_service.read_file_bytes(str(path)) == b"third"
+
+    def test_missing_file(self, temp_dir):
+        """Test that a missing file raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            file_service.read_file(str(temp_dir / "missing.txt"))
+
+    def test_size_limit(self, temp_dir):
+        """Test that files over the limit are rejected"""
+        path = temp_dir / "big.txt"
+        path.write_text("x" * 100)
+        with pytest.raises(FileSizeError):
+            file_service.read_file(str(path), max_size=10)
+
+
+class TestWriteFile:
+    """Tests for FileService.write_file"""
+
+    def test_creates_parent_dirs(self, temp_dir):
+        """Test that missing parent directories are created"""
+        path = temp_dir / "a" / "b" / "new.txt"
+        assert file_service.write_file(str(path), "héllo\n")
+        assert path.read_text(encoding="utf-8") == "héllo\n"
+
+    def test_truncates_existing(self, sample_file):
+        """Test that existing content is replaced"""
+        file_service.write_file(str(sample_file), "short")
+        assert sample_file.read_text() == "short"
+
+
+class TestListDirectory:
+    """Tests for FileService.list_directory"""
+
+    def test_cached_until_changed(self, temp_dir):
+        """Test that listings are reused and refreshed after writes"""
+        (temp_dir / "a.txt").write_text("a")
+        os.utime(temp_dir, (1_000_000, 1_000_000))
+        first = file_service.list_directory(str(temp_dir))
+        assert file_service.list_directory(str(temp_dir)) is first
+
+        file_service.write_file(str(temp_dir / "a.txt"), "longer content")
+        names = {item["name"]: item for item in file_service.list_directory(str(temp_dir))}
+        assert names["a.txt"]["size"] == len("longer content")
+
+    def test_cache_expires(self, temp_dir, monkeypatch):
+        """Test that a file edited in place shows its new size once the listing expires"""
+        # The package attribute is the service instance, not the module
+        file_service_module = sys.modules["mcp_local.services.file_service"]
+
+        (temp_dir / "a.txt").write_text("a")
+        os.utime(temp_dir, (1_000_000, 1_000_000))
+        file_service.list_directory(str(temp_dir))
+
+        # An outside edit that keeps the directory mtime
+        (temp_dir / "a.txt").write_text("longer content")
+        monkeypatch.setattr(file_service_module, "_DIR_CACHE_TTL_NS", 0)
+
+        names = {item["name"]: item for item in file_service.list_directory(str(temp_dir))}
+        assert names["a.txt"]["size"] == len("longer content")
+
+    def test_sees_new_entries(self, temp_dir):
+        """Test that entries created outside the service show up"""
+        os.utime(temp_dir, (1_000_000, 1_000_000))
+        file_service.list_directory(str(temp_dir))
+        (temp_dir / "sub").mkdir()
+        items = file_service.list_directory(str(temp_dir))
+        assert items[0]["name"] == "sub" and items[0]["is_dir"]
+
+    def test_symlinks_follow_target(self, temp_dir):
+        """Test that symlinks are typed and sized by their target"""
+        (temp_dir / "target.txt").write_text("12345")
+        (temp_dir / "sub").mkdir()
+        os.symlink(temp_dir / "target.txt", temp_dir / "link.txt")
+        os.symlink(temp_dir / "sub", temp_dir / "link_dir")
+
+        names = {item["name"]: item for item in file_service.list_directory(str(temp_dir))}
+        assert names["link.txt"]["is_file"] and names["link.txt"]["size"] == 5
+        assert names["link_dir"]["is_dir"] and not names["link_dir"]["is_file"]
+
+
+class TestCopyMove:
+    """Tests for FileService.copy_file and move_file"""
+
+    def test_copy_into_directory(self, sample_file, temp_dir):
+        """Test copying into an existing directory keeps the file name"""
+        target = temp_dir / "out"
+        target.mkdir()
+        assert file_service.copy_file(str(sample_file), str(target))
+        assert (target / "sample.txt").read_text() == sample_file.read_text()
+
+    def test_copy_onto_itself_keeps_content(self, sample_file):
+        """Test that copying a file onto itself fails instead of emptying it"""
+        content = sample_file.read_text()
+        with pytest.raises(FileAccessError):
+            file_service.copy_file(str(sample_file), str(sample_file))
+        assert sample_file.read_text() == content
+
+    def test_move_renames(self, sample_file, temp_dir):
+        """Test moving to a new name in another directory"""
+        content = sample_file.read_text()
+        dst = temp_dir / "sub" / "moved.txt"
+        assert file_service.move_file(str(sample_file), str(dst))
+        assert not sample_file.exists()
+        assert dst.read_text() == content
@@ -0,0 +1,68 @@
+"""
+Tests for the history service
+"""
+
+import json
+from datetime import datetime
+
+from mcp_local.services.history_service import HistoryService
+
+
+class TestHistoryService:
+    """Tests for HistoryService"""
+
+    def test_bounded_history(self):
+        """Test that the oldest entries are dropped past max_entries"""
+        service = HistoryService()
+        for i in range(service.max_entries + 5):
+            service.log_edit("edit", f"file{i}.txt", {})
+
+        history = service.get_history()
+        assert len(history) == service.max_entries
+        assert history[0]["file"] == "file5.txt"
+        assert history[-1]["file"] == f"file{service.max_entries + 4}.txt"
+
+    def test_limit_and_filter(self):
+        """Test limiting and per-file filtering"""
+        service = HistoryService()
+        for i in range(6):
+            service.log_edit("edit", "a.txt" if i % 2 else "b.txt", {"n": i})
+
+        assert [e["details"]["n"] for e in service.get_history(limit=2)] == [4, 5]
+        assert [e["details"]["n"] for e in service.get_file_history("a.txt", limit=2)] == [3, 5]
+        assert service.get_recent_files() == ["a.txt", "b.txt"]
+        service.log_edit("edit", "b.txt", {})
+        assert service.get_recent_files(limit=1) == ["b.txt"]
+
+    def test_indexes_follow_eviction(self):
+        """Test that per-file history and stats drop evicted entries"""
+        service = HistoryService()
+        service.log_edit("write_file", "old.txt", {})
+        for _ in range(service.max_entries):
+            service.log_edit("edit_lines", "new.txt", {})
+
+        assert service.get_file_history("old.txt") == []
+        stats = service.get_stats()
+        assert stats["action_counts"] == {"edit_lines": service.max_entries}
+        assert stats["most_edited_files"] == [("new.txt", service.max_entries)]
+        assert service.get_recent_files() == ["new.txt"]
+
+    def test_timestamps(self):
+        """Test that timestamps are stored as ints and formatted on export"""
+        service = HistoryService()
+        service.log_edit("edit", "a.txt", {})
+
+        assert isinstance(service.get_history()[0]["timestamp"], int)
+        assert service.get_stats()["recent_activity"] == 1
+        exported = service.export_history()["history"][0]["timestamp"]
+        assert datetime.fromisoformat(exported)
+
+    def test_export_json(self):
+        """Test that the JSON export round-trips"""
+        service = HistoryService()
+        service.log_edit("edit", "a.txt", {"lines": ["x"]})
+
+        data = json.loads(service.export_history_json())
+
+        assert data["total_entries"] == 1
+        assert data["history"][0]["details"] == {"lines": ["x"]}
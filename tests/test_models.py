@@ -0,0 +1,75 @@
+"""
+Tests for data models and serialization
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from mcp_local.models import _serialize
+from mcp_local.models.file_models import EditRecord, FileInfo, SearchMatch, SearchResults
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    """Run each test with orjson (when installed) and the stdlib fallback"""
+    if request.param == "json":
+        monkeypatch.setattr(_serialize, "orjson", None)
+    elif _serialize.orjson is None:
+        pytest.skip("orjson not installed")
+    return _serialize.serialize
+
+
+class TestSerialize:
+    """Tests for model serialization"""
+
+    def test_uses_to_dict_keys(self, serializer):
+        """Test that models with to_dict keep their key names"""
+        record = EditRecord(datetime(2024, 1, 2, 3, 4, 5), "edit", "a.py", {"lines": 2})
+        assert json.loads(serializer(record)) == record.to_dict()
+
+    def test_nested_results(self, serializer):
+        """Test that nested dataclasses are serialized recursively"""
+        match = SearchMatch("a.py", 3, 1, "foo", "**foo**", [])
+        results = SearchResults("foo", [match], files_searched=1, files_with_matches=1)
+        data = json.loads(serializer(results))
+        assert data["matches"] == [match.to_dict()]
+        assert data["files_searched"] == 1
+
+    def test_paths_and_datetimes(self, serializer):
+        """Test that Path and datetime fields become strings"""
+        info = FileInfo(Path("/tmp/x.txt"), "x.txt", 1, datetime(2024, 1, 1), False, True)
+        data = json.loads(serializer(info))
+        assert data["path"] == "/tmp/x.txt"
+        assert data["modified"] == "2024-01-01T00:00:00"
+
+    def test_indent(self, serializer):
+        """Test that indent pretty-prints the same document both ways"""
+        data = {"system": {"os": "Linux", "cpus": [1, 2]}, "temp": "/tmp"}
+        assert serializer(data, indent=True).decode("utf-8") == json.dumps(data, indent=2)
+
+
+class TestSearchResults:
+    """Tests for SearchResults"""
+
+    def test_group_by_file_after_append(self):
+        """Test that matches appended after construction are all grouped, in order"""
+        first = SearchMatch("a.py", 1, 1, "foo", "**foo**", [])
+        matches = [first]
+        results = SearchResults("foo", matches)
+        results.matches.append(SearchMatch("b.py", 2, 1, "foo", "**foo**", []))
+        results.matches.append(SearchMatch("a.py", 3, 1, "foo", "**foo**", []))
+
+        grouped = results.group_by_file()
+
+        assert list(grouped) == ["a.py", "b.py"]
+        assert [m.line_number for m in grouped["a.py"]] == [1, 3]
+        assert sum(map(len, grouped.values())) == results.total_matches == 3
+
+    def test_matches_not_reordered(self):
+        """Test that constructing results leaves the caller's list as given"""
+        matches = [SearchMatch(name, 1, 1, "x", "**x**", []) for name in ("b.py", "a.py")]
+        SearchResults("x", matches)
+        assert [m.file_path for m in matches] == ["b.py", "a.py"]
@@ -0,0 +1,166 @@
+"""
+Tests for search tools
+"""
+
+import os
+import re
+
+import pytest
+
+from mcp_local.tools.search_tools import _read_cached, _scan_text, _search_adv_impl, _search_in_files_impl
+
+
+class TestSearchAdv:
+    """Tests for the advanced search implementation"""
+
+    def test_finds_matches_in_walk_order(self, temp_dir):
+        """Test that matches are reported per file with context"""
+        for name in ("a.py", "b.py", "c.txt"):
+            (temp_dir / name).write_text("one\nneedle here\nthree\n")
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "d.py").write_text("Needle\n")
+
+        result = _search_adv_impl("needle", str(temp_dir), file_types="py")
+
+        assert "Found 3 matches in 3 files (searched 3 files)" in result
+        assert "c.txt" not in result
+        assert ">>    2: needle here" in result
+
+    def test_context_lines(self, temp_dir):
+        """Test that context stops at the start and end of the file"""
+        (temp_dir / "a.txt").write_text("l1\nl2 hit\nl3\nl4\nl5 hit\n")
+
+        result = _search_adv_impl("hit", str(temp_dir), context_lines=2)
+
+        assert "        1: l1\n     >>    2: l2 hit\n           3: l3\n           4: l4\n" in result
+        assert "        3: l3\n           4: l4\n     >>    5: l5 hit\n---" in result
+
+    def test_matches_on_one_line_share_context(self, temp_dir):
+        """Test that every match on a line is reported with that line's context"""
+        (temp_dir / "a.txt").write_text("x\nab ab ab\ny\n")
+
+        result = _search_adv_impl("ab", str(temp_dir), context_lines=1)
+
+        assert "Found 3 matches in 1 files" in result
+        assert result.count("     >>    2: ab ab ab\n") == 3
+
+    def test_max_results(self, temp_dir):
+        """Test that the result count stops at max_results"""
+        for i in range(40):
+            (temp_dir / f"f{i:02d}.txt").write_text("hit\nhit\n")
+
+        result = _search_adv_impl("hit", str(temp_dir), max_results=5)
+
+        assert "Found 5 matches" in result
+        assert "Results limited to 5 matches" in result
+
+    def test_no_matches(self, temp_dir):
+        """Test the empty result message"""
+        (temp_dir / "a.txt").write_text("nothing\n")
+
+        assert "No matches found" in _search_adv_impl("needle", str(temp_dir))
+
+    def test_anchors_and_columns(self, temp_dir):
+        """Test that ^ anchors per line and columns are 1-based within the line"""
+        (temp_dir / "a.txt").write_text("x = 1\n  def foo():\ndef bar():\n")
+
+        result = _search_adv_impl("^def", str(temp_dir), use_regex=True)
+
+        assert "Found 1 matches" in result
+        assert ">>    3: def bar():" in result
+
+    def test_regex_stays_within_a_line(self, temp_dir):
+        """Test that a regex can't match across a line break"""
+        (temp_dir / "a.txt").write_text("foo\nbar baz\nfoo bar\n")
+
+        result = _search_adv_impl(r"foo\sbar", str(temp_dir), use_regex=True)
+        assert "Found 1 matches" in result
+        assert ">>    3: foo bar" in result
+
+        [match] = _scan_text("a foo\nbar, foo bar\n", "a.txt", re.compile(r"foo\s+bar"), None, False, 0, 10)
+        assert (match.line_number, match.column) == (2, 6)
+
+    def test_literal_prefilter_case_folding(self, temp_dir):
+        """Test that the literal prefilter keeps files IGNORECASE would match"""
+        (temp_dir / "a.txt").write_text("STOP\n", encoding="utf-8")
+        (temp_dir / "b.txt").write_text("ſtop\n", encoding="utf-8")  # long s folds to "s"
+        (temp_dir / "c.txt").write_text("go\n", encoding="utf-8")
+
+        assert "Found 2 matches in 2 files" in _search_adv_impl("stop", str(temp_dir))
+        assert "Found 1 matches in 1 files" in _search_adv_impl("STOP", str(temp_dir), case_sensitive=True)
+
+    def test_literal_bytes_search(self, temp_dir):
+        """Test that case-sensitive literals search raw bytes with character columns"""
+        (temp_dir / "a.txt").write_bytes("héllo\r\nwörld wörld\r\n".encode("utf-8"))
+
+        result = _search_adv_impl("wörld", str(temp_dir), case_sensitive=True, context_lines=1)
+
+        assert "Found 2 matches in 1 files" in result
+        assert "        1: héllo\n     >>    2: wörld wörld\n" in result
+
+        content = "héllo wörld\n".encode("utf-8")
+        [match] = _scan_text(content, "a.txt", re.compile("wörld".encode("utf-8")), None, False, 0, 10)
+        assert match.column == 7
+        assert match.highlighted_line == "héllo **wörld**"
+
+    def test_include_patterns(self, temp_dir):
+        """Test that include globs are matched against file names"""
+        for name in ("a.md", "b.rst", "c.txt"):
+            (temp_dir / name).write_text("needle\n")
+
+        result = _search_adv_impl("needle", str(temp_dir), include_patterns="*.md, *.rst")
+
+        assert "Found 2 matches in 2 files" in result
+        assert "c.txt" not in result
+
+
+class TestSearchInFiles:
+    """Tests for the grep-like search implementation"""
+
+    def test_file_pattern(self, temp_dir):
+        """Test name and path file patterns"""
+        (temp_dir / "pkg").mkdir()
+        (temp_dir / "pkg" / "mod.py").write_text("needle\n")
+        (temp_dir / "top.py").write_text("needle\n")
+        (temp_dir / "notes.txt").write_text("needle\n")
+
+        assert "Found 2 matches" in _search_in_files_impl("needle", str(temp_dir), "*.py")
+        result = _search_in_files_impl("needle", str(temp_dir), "pkg/*.py")
+        assert "Found 1 matches" in result
+        assert "mod.py:1: needle" in result
+
+    def test_literal_and_regex_lines(self, temp_dir):
+        """Test that each matching line is reported once with its line number"""
+        (temp_dir / "a.txt").write_bytes(b"foo foo\r\nbar\r\nfood\r\n")
+        (temp_dir / "empty.txt").write_bytes(b"")
+
+        result = _search_in_files_impl("foo", str(temp_dir))
+        assert "Found 2 matches" in result
+        assert "a.txt:1: foo foo" in result
+        assert "a.txt:3: food" in result
+
+        result = _search_in_files_impl(r"^ba.$", str(temp_dir), use_regex=True)
+        assert "Found 1 matches" in result
+        assert "a.txt:2: bar" in result
+
+    def test_regex_stays_within_a_line(self, temp_dir):
+        """Test that a regex can't match across a line break"""
+        (temp_dir / "a.txt").write_text("foo\nbar baz\nfoo bar\n")
+
+        result = _search_in_files_impl(r"foo\sbar", str(temp_dir), use_regex=True)
+        assert "Found 1 matches" in result
+        assert "a.txt:3: foo bar" in result
+
+        assert "No matches found" in _search_in_files_impl(r"o$\n^b", str(temp_dir), use_regex=True)
+
+
+class TestReadCached:
+    """Tests for the non-blocking page cache read"""
+
+    @pytest.mark.skipif(not hasattr(os, "RWF_NOWAIT"), reason="needs preadv2 RWF_NOWAIT")
+    def test_reads_cached_file(self, temp_dir):
+        """Test that a freshly written file is read whole, or None where NOWAIT is unsupported"""
+        path = temp_dir / "a.txt"
+        path.write_bytes(b"one\r\ntwo\n")
+
+        assert _read_cached(str(path)) in (b"one\r\ntwo\n", None)
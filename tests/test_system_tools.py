@@ -0,0 +1,112 @@
+"""
+Tests for system tools
+"""
+
+import os
+
+import psutil
+import pytest
+
+from mcp_local.core.config import DANGEROUS_COMMANDS_RE
+from mcp_local.tools.system_tools import (
+    FIND_OVERSCAN, FIND_PARALLEL_STAT_MIN, FindFilesTool, RunCommandTool, _direct_argv,
+    _linux_meminfo, _meminfo_kb
+)
+
+
+class TestMeminfo:
+    """Tests for /proc/meminfo parsing"""
+
+    def test_fields(self):
+        """Test that fields are read in kB and missing ones report -1"""
+        buf = b"MemTotal:       16384 kB\nMemFree:         1024 kB\nMemAvailable:    8192 kB\n"
+
+        assert _meminfo_kb(buf, b"MemTotal:") == 16384
+        assert _meminfo_kb(buf, b"MemAvailable:") == 8192
+        assert _meminfo_kb(buf, b"SwapTotal:") == -1
+
+    def test_field_at_line_start(self):
+        """Test that a field name isn't matched inside a longer one"""
+        buf = b"MemTotal:       16384 kB\nSwapCached:        64 kB\nCached:          2048 kB\n"
+
+        assert _meminfo_kb(buf, b"Cached:") == 2048
+
+    @pytest.mark.skipif(not os.path.exists("/proc/meminfo"), reason="Linux only")
+    def test_matches_psutil(self):
+        """Test that total, available and used agree with psutil.virtual_memory()"""
+        total, available, used = _linux_meminfo()
+        memory = psutil.virtual_memory()
+
+        # Memory moves between the two reads, so allow 64 MiB of drift
+        tolerance = 64 * 1024 * 1024
+        assert total == memory.total
+        assert abs(available - memory.available) < tolerance
+        assert abs(used - memory.used) < tolerance
+
+
+class TestRunCommand:
+    """Tests for run_command's security checks"""
+
+    @pytest.mark.parametrize("command", [
+        "rm -rf x", "rmdir foo", "find . -delete", "userdel bob", "groupdel staff",
+        "chpasswd", "visudo", "rmmod snd", "SUDO ls",
+    ])
+    def test_dangerous_commands(self, command):
+        """Test that DANGEROUS_COMMANDS are refused anywhere in a command"""
+        assert DANGEROUS_COMMANDS_RE.search(command)
+
+    @pytest.mark.parametrize("command", ["ls | wc", "echo a && b", "CHMOD +x f", "cat x > y"])
+    def test_dangerous_patterns(self, command):
+        """Test that chaining, redirection and listed tools are refused"""
+        assert RunCommandTool()._is_command_dangerous(command)
+
+    @pytest.mark.parametrize("command", ["ls -l src", "git log", "tree -L 2"])
+    def test_safe_command(self, command):
+        """Test that plain commands pass the pattern check, with or without trigger characters"""
+        assert not RunCommandTool()._is_command_dangerous(command)
+
+    def test_direct_argv(self):
+        """Test that only commands without shell syntax bypass the shell"""
+        assert _direct_argv('echo "a  b" c') == ["echo", "a  b", "c"]
+        for command in ("echo $HOME", "ls *.py", "FOO=1 env", "echo 'open", ""):
+            assert _direct_argv(command) is None
+
+    def test_builtin_falls_back_to_shell(self):
+        """Test that shell builtins still run"""
+        assert "Exit code: 0" in RunCommandTool().execute("cd .")
+
+
+class TestFindFiles:
+    """Tests for the find_files tool"""
+
+    def test_newest_first_and_early_exit(self, temp_dir):
+        """Test that the walk stops past max_results and output is newest first"""
+        (temp_dir / ".hidden").mkdir()
+        (temp_dir / ".hidden" / "skip.log").write_text("x")
+        for i in range(20):
+            path = temp_dir / f"f{i:02d}.log"
+            path.write_text("x")
+            os.utime(path, (1000 + i, 1000 + i))
+        (temp_dir / "other.txt").write_text("x")
+
+        result = FindFilesTool().execute("*.log", str(temp_dir), max_results=2)
+
+        assert f"Found {2 * FIND_OVERSCAN} files" in result
+        assert "skip.log" not in result
+        lines = [line for line in result.splitlines() if line.endswith("(1 B)")]
+        assert len(lines) == 2
+        assert [os.path.getmtime(line.split(" (")[0]) for line in lines] == sorted(
+            (os.path.getmtime(line.split(" (")[0]) for line in lines), reverse=True)
+
+    def test_many_matches_stat_on_pool(self, temp_dir):
+        """Test that matches stat'ed in parallel are still ranked newest first"""
+        for i in range(FIND_PARALLEL_STAT_MIN + 10):
+            path = temp_dir / f"f{i:03d}.log"
+            path.write_text("x" * i)
+            os.utime(path, (1000 + i, 1000 + i))
+
+        result = FindFilesTool().execute("*.log", str(temp_dir), max_results=100)
+
+        last = FIND_PARALLEL_STAT_MIN + 9
+        assert f"Found {last + 1} files" in result
+        assert result.splitlines()[2].endswith(f"f{last:03d}.log ({last} B)")
@@ -0,0 +1,218 @@
+"""
+Tests for core utilities
+"""
+
+import mimetypes
+import os
+import shutil
+import pytest
+from pathlib import Path
+
+from mcp_local.core.config import DEFAULT_EXCLUDE_PATTERNS
+from mcp_local.core.utils import (
+    copy_file_fast, count_lines, format_file_size, is_text_by_ext, is_text_file, line_span,
+    should_exclude_file,
+    validate_path, validate_path_str, walk_filtered
+)
+
+
+class TestShouldExcludeFile:
+    """Tests for should_exclude_file"""
+
+    @pytest.mark.parametrize("path", [
+        "node_modules/pkg/index.js",
+        "src/node_modules/pkg/index.js",
+        ".git/config",
+        "pkg/__pycache__/mod.cpython-311.pyc",
+        "mcp_local.egg-info/PKG-INFO",
+        "logs/server.log",
+        ".DS_Store",
+        "static/app.min.js",
+    ])
+    def test_excluded_paths(self, path):
+        """Test that default patterns exclude common paths at any depth"""
+        assert should_exclude_file(Path(path), DEFAULT_EXCLUDE_PATTERNS)
+
+    @pytest.mark.parametrize("path", [
+        "src/main.py",
+        "docs/build.md",
+        "builder/app.py",
+        "env.py",
+    ])
+    def test_included_paths(self, path):
+        """Test that regular source files are not excluded"""
+        assert not should_exclude_file(Path(path), DEFAULT_EXCLUDE_PATTERNS)
+
+    @pytest.mark.parametrize("path", ["node_modules", "src/build", "pkg.egg-info"])
+    def test_excluded_directories(self, path):
+        """Test that "dir/*" patterns match the directory itself, for pruning"""
+        assert should_exclude_file(Path(path), DEFAULT_EXCLUDE_PATTERNS, is_dir=True)
+
+    @pytest.mark.parametrize("path", ["build", "src/dist", "coverage", "pkg.egg-info"])
+    def test_files_named_like_excluded_directories(self, path):
+        """Test that a plain file named after an excluded directory is kept"""
+        assert not should_exclude_file(Path(path), DEFAULT_EXCLUDE_PATTERNS)
+
+    def test_accepts_string_paths(self):
+        """Test that plain string paths are supported"""
+        assert should_exclude_file("a/dist/bundle.js", ["dist/*"])
+        assert not should_exclude_file("a/distro/bundle.js", ["dist/*"])
+
+    def test_no_patterns(self):
+        """Test that an empty pattern list excludes nothing"""
+        assert not should_exclude_file(Path("anything.pyc"), [])
+
+
+class TestWalkFiltered:
+    """Tests for walk_filtered"""
+
+    def test_prunes_excluded_directories(self, temp_dir):
+        """Test that name and path patterns prune directories and skip files"""
+        for rel in ("keep/a.py", "keep/b.log", "cache.tmp/c.py", "out/dist/d.py", ".hidden/e.py", "keep/dist"):
+            (temp_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            (temp_dir / rel).write_text("x")
+
+        found = sorted(os.path.relpath(entry.path, temp_dir)
+                       for entry in walk_filtered(temp_dir, ["*.log", "*.tmp", "dist/*"], include_hidden=False))
+
+        assert found == [os.path.join("keep", "a.py"), os.path.join("keep", "dist")]
+
+
+class TestIsTextFile:
+    """Tests for is_text_file"""
+
+    def test_extension_decides_known_types(self, temp_dir):
+        """Test that known extensions are classified without sniffing contents"""
+        (temp_dir / "a.py").write_bytes(b"\0\0")
+        (temp_dir / "b.png").write_bytes(b"plain text")
+
+        assert is_text_file(temp_dir / "a.py")
+        assert not is_text_file(temp_dir / "b.png")
+
+    @pytest.mark.parametrize("ext", [".rst", ".patch", ".hs", ".scala", ".tex"])
+    def test_system_mime_tables(self, ext):
+        """Test that extensions only the system MIME tables know are still text"""
+        mime_type, _ = mimetypes.guess_type("x" + ext, strict=False)
+        if not (mime_type and mime_type.startswith("text")):
+            pytest.skip(f"no text MIME type for {ext} on this system")
+        assert is_text_by_ext(ext)
+
+    def test_unknown_extension_is_sniffed(self, temp_dir):
+        """Test that files without a known extension are checked for NUL bytes"""
+        (temp_dir / "README").write_bytes(b"hello\n")
+        (temp_dir / "blob").write_bytes(b"\x7fELF\0\0")
+
+        assert is_text_file(temp_dir / "README")
+        assert not is_text_file(temp_dir / "blob")
+        assert not is_text_file(temp_dir / "missing.py")
+
+
+class TestValidatePath:
+    """Tests for validate_path"""
+
+    def test_resolves_relative_to_cwd(self, temp_dir, monkeypatch):
+        """Test that relative paths resolve against the current directory"""
+        monkeypatch.chdir(temp_dir)
+        assert validate_path_str("a.txt") == os.path.join(os.path.realpath(temp_dir), "a.txt")
+        assert validate_path("a.txt") == Path(temp_dir).resolve() / "a.txt"
+
+    def test_expands_user(self):
+        """Test that ~ is expanded"""
+        assert validate_path_str("~") == os.path.realpath(os.path.expanduser("~"))
+
+    def test_retargeted_symlink(self, temp_dir):
+        """Test that a symlink retargeted after a lookup resolves to its new target"""
+        for name in ("one", "two"):
+            (temp_dir / name).write_text(name)
+        link = temp_dir / "link"
+        link.symlink_to(temp_dir / "one")
+        assert validate_path(str(link)).name == "one"
+
+        link.unlink()
+        link.symlink_to(temp_dir / "two")
+
+        assert validate_path(str(link)).name == "two"
+
+
+class TestFormatFileSize:
+    """Tests for format_file_size"""
+
+    @pytest.mark.parametrize("size, expected", [
+        (0, "0 bytes"),
+        (1023, "1023 bytes"),
+        (1024, "1.0 KB"),
+        (1536, "1.5 KB"),
+        (1024 * 1024 - 1, "1024.0 KB"),
+        (5 * 1024 * 1024, "5.0 MB"),
+        (3 * 1024 ** 3, "3.0 GB"),
+        (2048 * 1024 ** 4, "2048.0 TB"),
+    ])
+    def test_units(self, size, expected):
+        """Test unit selection at the boundaries"""
+        assert format_file_size(size) == expected
+
+
+class TestCopyFileFast:
+    """Tests for copy_file_fast"""
+
+    def test_copies_content_and_mtime(self, temp_dir):
+        """Test that data and timestamps are copied"""
+        src = Path(temp_dir) / "src.bin"
+        dst = Path(temp_dir) / "dst.bin"
+        data = os.urandom(200_000)
+        src.write_bytes(data)
+        os.utime(src, (1_000_000, 1_000_000))
+
+        copy_file_fast(src, dst)
+
+        assert dst.read_bytes() == data
+        assert dst.stat().st_mtime == 1_000_000
+
+    def test_overwrites_existing(self, temp_dir):
+        """Test that a longer destination is truncated"""
+        src = Path(temp_dir) / "src.txt"
+        dst = Path(temp_dir) / "dst.txt"
+        src.write_text("short")
+        dst.write_text("much longer content")
+
+        copy_file_fast(str(src), str(dst))
+
+        assert dst.read_text() == "short"
+
+    def test_same_file_is_refused(self, temp_dir):
+        """Test that copying a file onto itself raises and leaves it intact"""
+        src = Path(temp_dir) / "a.txt"
+        src.write_text("keep me")
+        (Path(temp_dir) / "link.txt").symlink_to(src)
+
+        with pytest.raises(shutil.SameFileError):
+            copy_file_fast(src, src)
+        with pytest.raises(shutil.SameFileError):
+            copy_file_fast(src, Path(temp_dir) / "link.txt")
+
+        assert src.read_text() == "keep me"
+
+    def test_directory_source_is_refused(self, temp_dir):
+        """Test that a directory source raises without creating dst"""
+        src = Path(temp_dir) / "dir"
+        src.mkdir()
+        dst = Path(temp_dir) / "out"
+
+        with pytest.raises(IsADirectoryError):
+            copy_file_fast(src, dst)
+
+        assert not dst.exists()
+
+
+class TestLineSpan:
+    """Tests for count_lines and line_span"""
+
+    @pytest.mark.parametrize("text", ["", "a", "a\n", "a\nb", "a\n\nb\n"])
+    def test_matches_splitlines(self, text):
+        """Test that slicing by offsets matches slicing a list of lines"""
+        lines = text.splitlines(keepends=True)
+        assert count_lines(text) == len(lines)
+        for start in range(len(lines) + 2):
+            for end in range(len(lines) + 2):
+                start_off, end_off = line_span(text, start, end)
+                assert text[start_off:end_off] == "".join(lines[start:end])